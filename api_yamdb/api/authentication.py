@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+USER_STATE_FIELDS = ('id', 'username', 'role', 'is_superuser', 'is_active')
+"""Поля пользователя, достаточные для проверки прав доступа."""
+
+
+def get_access_token(user):
+    """Выдает токен доступа с ролью пользователя в claims."""
+    token = AccessToken.for_user(user)
+    token['role'] = user.role
+    token['is_superuser'] = user.is_superuser
+    return token
+
+
+def get_user_state_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def get_user_state(user_id):
+    """Возвращает права пользователя из кеша, при промахе - из базы."""
+    key = get_user_state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values(
+            *USER_STATE_FIELDS
+        ).first() or {}
+        cache.set(key, state, settings.AUTH_USER_CACHE_TIMEOUT)
+    return state or None
+
+
+def forget_user_state(user_id):
+    cache.delete(get_user_state_key(user_id))
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без загрузки пользователя из базы.
+
+    Пользователь собирается из кешированного состояния с отложенными
+    остальными полями. Если роль в claims токена не совпадает с текущей,
+    токен считается устаревшим.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя'
+            )
+        state = get_user_state(user_id)
+        if state is None or not state['is_active']:
+            raise AuthenticationFailed(
+                'Пользователь не найден или неактивен', code='user_not_found'
+            )
+        if 'role' in validated_token and (
+            validated_token['role'] != state['role']
+            or validated_token.get('is_superuser') != state['is_superuser']
+        ):
+            raise AuthenticationFailed(
+                'Права пользователя изменились, получите новый токен',
+                code='token_outdated'
+            )
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in state
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [state[name] for name in field_names]
+        )
@@ -0,0 +1,219 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+TITLES_CACHE_NAMESPACE = 'titles'
+"""Произведения вместе с жанрами, категориями и рейтингом."""
+
+GENRES_CACHE_NAMESPACE = 'genres'
+"""Жанры."""
+
+CATEGORIES_CACHE_NAMESPACE = 'categories'
+"""Категории."""
+
+REVIEWS_CACHE_NAMESPACE = 'reviews'
+"""Отзывы."""
+
+COMMENTS_CACHE_NAMESPACE = 'comments'
+"""Комментарии."""
+
+USERS_CACHE_NAMESPACE = 'users'
+"""Пользователи: их имена выводятся как авторы отзывов и комментариев."""
+
+CACHE_NAMESPACES = (
+    TITLES_CACHE_NAMESPACE,
+    GENRES_CACHE_NAMESPACE,
+    CATEGORIES_CACHE_NAMESPACE,
+    REVIEWS_CACHE_NAMESPACE,
+    COMMENTS_CACHE_NAMESPACE,
+    USERS_CACHE_NAMESPACE,
+)
+
+CACHE_EVENTS = ('hits', 'misses')
+
+
+def get_generation(namespace):
+    """Возвращает текущее поколение данных пространства кеша.
+
+    Поколение - время последнего изменения данных в наносекундах. Если
+    счетчик вытеснен из кеша, он заново инициализируется текущим
+    временем, поэтому старые поколения не переиспользуются.
+    """
+    return cache.get_or_set(
+        f'generation:{namespace}', time.time_ns, timeout=None
+    )
+
+
+def bump_generation(namespace):
+    """Делает недействительными все закешированные ответы пространства."""
+    cache.set(f'generation:{namespace}', time.time_ns(), timeout=None)
+
+
+def bump_generations(namespaces=CACHE_NAMESPACES):
+    for namespace in namespaces:
+        bump_generation(namespace)
+
+
+def generation_to_datetime(generation):
+    return datetime.fromtimestamp(generation / 10 ** 9, tz=timezone.utc)
+
+
+def count_cache_event(namespace, event):
+    key = f'stats:{namespace}:{event}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_cache_stats(namespace):
+    """Возвращает счетчики попаданий и промахов кеша пространства."""
+    return {
+        event: cache.get(f'stats:{namespace}:{event}', 0)
+        for event in CACHE_EVENTS
+    }
+
+
+class VersionedCacheMixin:
+    """Кеширует ответы list и retrieve до изменения данных пространства.
+
+    Ключ строится из поколения пространства, действия, объекта и
+    нормализованной строки запроса: учитываются только параметры
+    фильтров и перечисленные в cache_query_params.
+    """
+
+    cache_namespace = None
+    cache_query_params = ()
+
+    def get_cache_query_params(self):
+        params = set(self.cache_query_params)
+        filterset_class = getattr(self, 'filterset_class', None)
+        if filterset_class is not None:
+            params.update(filterset_class.base_filters)
+        return params
+
+    def get_cache_key(self, request):
+        allowed = self.get_cache_query_params()
+        query = urlencode(sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            if name in allowed
+            for value in values
+        ))
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        digest = hashlib.md5(
+            f'{request.get_host()}:{self.action}:{lookup}:{query}'.encode()
+        ).hexdigest()
+        generation = get_generation(self.cache_namespace)
+        return f'response:{self.cache_namespace}:{generation}:{digest}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            count_cache_event(self.cache_namespace, 'hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        count_cache_event(self.cache_namespace, 'misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalListMixin:
+    """Отвечает 304 на условные GET-запросы до выборки и сериализации.
+
+    Валидаторы списка строятся из поколений etag_namespaces.
+    """
+
+    etag_namespaces = ()
+
+    def list(self, request, *args, **kwargs):
+        stamps = [
+            generation_to_datetime(get_generation(namespace))
+            for namespace in self.etag_namespaces
+        ]
+        return self.conditional_response(
+            super().list, stamps, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, stamps, request, *args,
+                             **kwargs):
+        source = ':'.join([
+            request.get_host(),
+            request.accepted_renderer.format,
+            self.action,
+            urlencode(sorted(self.kwargs.items())),
+            urlencode(sorted(request.query_params.lists()), doseq=True),
+            *(stamp.isoformat() for stamp in stamps),
+        ])
+        etag = quote_etag(hashlib.md5(source.encode()).hexdigest())
+        last_modified = int(max(stamps).timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Добавляет условные GET-запросы к отдельному объекту.
+
+    Валидаторы объекта строятся из его updated_at и поколений
+    etag_detail_namespaces, от которых зависит представление объекта.
+    Если ответ кешируется, в них входит и поколение cache_namespace:
+    иначе устаревшее тело из кеша получило бы новый ETag.
+    """
+
+    etag_detail_namespaces = ()
+
+    def get_etag_detail_namespaces(self):
+        namespaces = list(self.etag_detail_namespaces)
+        cache_namespace = getattr(self, 'cache_namespace', None)
+        if cache_namespace is not None and (
+            cache_namespace not in namespaces
+        ):
+            namespaces.append(cache_namespace)
+        return namespaces
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        updated_at = self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).prefetch_related(None).values_list(
+            'updated_at', flat=True
+        ).first()
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+        stamps = [updated_at] + [
+            generation_to_datetime(get_generation(namespace))
+            for namespace in self.get_etag_detail_namespaces()
+        ]
+        return self.conditional_response(
+            super().retrieve, stamps, request, *args, **kwargs
+        )
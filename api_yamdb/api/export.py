@@ -0,0 +1,66 @@
+import json
+from itertools import islice
+
+from rest_framework.fields import DateTimeField
+from rest_framework.utils.encoders import JSONEncoder
+
+from reviews.models import Review
+
+from .serializers import TitleReadSerializer, get_title_genres
+
+EXPORT_CHUNK_SIZE = 1000
+"""Сколько произведений выбирается и дополняется связанными данными за раз."""
+
+
+def get_title_reviews(title_ids):
+    """Отзывы произведений одним запросом: {id произведения: [отзывы]}."""
+    date_field = DateTimeField()
+    reviews = {}
+    for row in Review.objects.filter(title_id__in=title_ids).order_by(
+        'title_id', 'pub_date', 'id'
+    ).values(
+        'id', 'title_id', 'text', 'author__username', 'score', 'pub_date'
+    ).iterator():
+        reviews.setdefault(row['title_id'], []).append({
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'score': row['score'],
+            'pub_date': date_field.to_representation(row['pub_date']),
+        })
+    return reviews
+
+
+def export_titles(queryset, include_reviews=False,
+                  chunk_size=EXPORT_CHUNK_SIZE):
+    """Выдает произведения построчно в формате NDJSON.
+
+    Произведения читаются курсором пачками по chunk_size; жанры и отзывы
+    загружаются одним запросом на пачку, поэтому расход памяти не зависит
+    от размера каталога.
+    """
+    serializer = TitleReadSerializer()
+    date_field = DateTimeField()
+    rows = queryset.order_by('id').values(
+        *TitleReadSerializer.get_values(), 'updated_at'
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        title_ids = [row['id'] for row in chunk]
+        genres = get_title_genres(title_ids)
+        reviews = get_title_reviews(title_ids) if include_reviews else None
+        lines = []
+        for row in chunk:
+            data = serializer.serialize_row(row, genres)
+            data['updated_at'] = date_field.to_representation(
+                row['updated_at']
+            )
+            if include_reviews:
+                data['reviews'] = reviews.get(row['id'], [])
+            lines.append(json.dumps(
+                data, cls=JSONEncoder, ensure_ascii=False,
+                separators=(',', ':')
+            ))
+        yield '\n'.join(lines) + '\n'
@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cache import get_generation
+from .fieldsets import parse_field_names
+
+FACETS_QUERY_PARAM = 'facets'
+
+
+def count_by(queryset, field, **values):
+    """Число различных значений field для каждой комбинации значений.
+
+    values сопоставляет ключам результата пути полей выборки.
+    """
+    paths = list(values.values())
+    rows = queryset.prefetch_related(None).order_by().values(*paths).annotate(
+        facet_count=Count(field, distinct=True)
+    ).order_by('-facet_count', *paths)
+    return [
+        {
+            **{key: row[path] for key, path in values.items()},
+            'count': row['facet_count'],
+        }
+        for row in rows
+    ]
+
+
+def get_genre_facet(queryset):
+    return count_by(
+        queryset.filter(genre__isnull=False),
+        'pk',
+        slug='genre__slug',
+        name='genre__name'
+    )
+
+
+def get_category_facet(queryset):
+    return count_by(
+        queryset.filter(category__isnull=False),
+        'pk',
+        slug='category__slug',
+        name='category__name'
+    )
+
+
+def get_year_facet(queryset):
+    return count_by(queryset, 'pk', value='year')
+
+
+class FacetMixin:
+    """Добавляет к странице списка счетчики по значениям из ?facets=.
+
+    facets сопоставляет имени счетчика функцию, которая группирует
+    выборку по значениям одноименного фильтра. Выборка фильтруется
+    всеми фильтрами запроса, кроме этого, чтобы счетчики показывали,
+    сколько объектов останется при выборе другого значения. Счетчики
+    без фильтров кешируются до изменения данных пространств
+    facet_namespaces. Неизвестные имена счетчиков игнорируются.
+    """
+
+    facets = {}
+    facet_namespaces = ()
+
+    def get_facet_names(self):
+        names = parse_field_names(
+            self.request.query_params.get(FACETS_QUERY_PARAM, '')
+        )
+        return sorted(names & set(self.facets))
+
+    def get_facet_filters(self, name):
+        params = self.request.query_params.copy()
+        params.pop(name, None)
+        filters = set(self.filterset_class.base_filters) - {'ordering'}
+        return params, bool(filters & set(params))
+
+    def get_facet(self, name):
+        params, filtered = self.get_facet_filters(name)
+        if not filtered:
+            generations = ':'.join(
+                str(get_generation(namespace))
+                for namespace in self.facet_namespaces
+            )
+            key = f'facets:{self.basename}:{generations}:{name}'
+            facet = cache.get(key)
+            if facet is None:
+                facet = self.facets[name](self.get_queryset())
+                cache.set(key, facet, settings.RESPONSE_CACHE_TIMEOUT)
+            return facet
+        # Значения фильтров уже проверены при выборке страницы.
+        return self.facets[name](self.filterset_class(
+            params, queryset=self.get_queryset(), request=self.request
+        ).qs)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        names = self.get_facet_names()
+        if names:
+            response.data['facets'] = {
+                name: self.get_facet(name) for name in names
+            }
+        return response
@@ -0,0 +1,71 @@
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+def parse_field_names(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Выдает только поля, перечисленные в ?fields= и не указанные в ?omit=.
+
+    sparse_fieldset сопоставляет полям сериализатора поля модели, которые
+    нужны для их вывода; по нему в GET-запросах сужается выборка через
+    only(). Связи из sparse_select_related и sparse_prefetch_related
+    загружаются, только если запрошено соответствующее поле сериализатора.
+    Неизвестные имена полей игнорируются.
+    """
+
+    sparse_fieldset = {}
+    sparse_select_related = {}
+    sparse_prefetch_related = {}
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            params = self.request.query_params
+            if self.request.method == 'GET' and (
+                FIELDS_QUERY_PARAM in params or OMIT_QUERY_PARAM in params
+            ):
+                fields = set(self.sparse_fieldset)
+                if FIELDS_QUERY_PARAM in params:
+                    fields &= parse_field_names(params[FIELDS_QUERY_PARAM])
+                fields -= parse_field_names(
+                    params.get(OMIT_QUERY_PARAM, '')
+                )
+                self._sparse_fields = fields
+        return self._sparse_fields
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        select_related = [
+            path for field, path in self.sparse_select_related.items()
+            if field in fields
+        ]
+        prefetch_related = [
+            path for field, path in self.sparse_prefetch_related.items()
+            if field in fields
+        ]
+        # Поля сортировки курсорной пагинации нужны для построения курсора.
+        ordering = getattr(self.pagination_class, 'cursor_ordering', ())
+        only = {'pk', *(name.lstrip('-') for name in ordering)}
+        for field in fields:
+            only.update(self.sparse_fieldset[field])
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset.only(*only)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in set(target.fields) - fields:
+                target.fields.pop(name)
+        return serializer
@@ -1,6 +1,19 @@
 import django_filters
+from django_filters.constants import EMPTY_VALUES
 
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class StableOrderingFilter(django_filters.OrderingFilter):
+    """Сортировка с id в конце, чтобы страницы не пересекались."""
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return qs.order_by(
+            *(self.get_ordering_value(param) for param in value), 'pk'
+        )
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -8,9 +21,19 @@ class TitleFilter(django_filters.FilterSet):
     genre = django_filters.CharFilter('genre__slug')
     name = django_filters.CharFilter('name')
     year = django_filters.NumberFilter('year')
+    search = django_filters.CharFilter(method='filter_search')
+    # Рейтинг сортируется по сохраненной байесовской оценке ranking.
+    ordering = StableOrderingFilter(fields=(
+        ('ranking', 'rating'),
+        ('year', 'year'),
+        ('name', 'name'),
+    ))
 
     class Meta:
         model = Title
         fields = (
             'id', 'name', 'year', 'description', 'genre', 'category'
         )
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,82 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('api.sql')
+
+SLOWEST_SQL_LENGTH = 200
+"""Сколько символов самого медленного запроса выводится в лог."""
+
+
+class QueryStats:
+    """Обертка execute_wrapper: число запросов, их время и самый медленный.
+
+    Параметры запросов не сохраняются, поэтому в лог не попадают
+    персональные данные.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = ''
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if elapsed > self.slowest_duration:
+                self.slowest_duration = elapsed
+                self.slowest_sql = sql
+
+
+class SQLInstrumentationMiddleware:
+    """Считает SQL-запросы запроса и отдает их в Server-Timing и в лог.
+
+    Включается настройкой SQL_INSTRUMENTATION и не требует DEBUG=True.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        timings = [
+            f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"',
+            f'db-slowest;dur={stats.slowest_duration * 1000:.2f}',
+            f'app;dur={total * 1000:.2f}',
+        ]
+        if response.has_header('Server-Timing'):
+            timings.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(timings)
+
+        logger.info(
+            'method=%s path=%s status=%s queries=%d db_ms=%.2f '
+            'slowest_ms=%.2f total_ms=%.2f slowest_sql="%s"',
+            request.method,
+            request.path,
+            response.status_code,
+            stats.count,
+            stats.duration * 1000,
+            stats.slowest_duration * 1000,
+            total * 1000,
+            stats.slowest_sql[:SLOWEST_SQL_LENGTH].replace('"', "'"),
+        )
+        return response
@@ -0,0 +1,191 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from .cache import get_generation
+
+
+class EstimatedCountPage(Page):
+    """Страница списка, количество объектов в котором оценено."""
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+    # Номера соседних страниц не проверяются по оценке количества:
+    # она может быть меньше точного.
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator с кешированным количеством объектов.
+
+    Точное количество кешируется по SQL-запросу и поколениям пространств
+    кеша namespaces, поэтому сбрасывается при изменении данных. Если
+    объектов больше PAGINATION_COUNT_ESTIMATE_THRESHOLD, вместо нового
+    COUNT(*) возвращается оценка: последнее точное значение не старше
+    PAGINATION_COUNT_ESTIMATE_MAX_AGE или оценка планировщика PostgreSQL.
+    """
+
+    def __init__(self, *args, namespaces=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namespaces = namespaces
+        self.count_estimated = False
+
+    def get_signature(self):
+        query = self.object_list.query
+        sql, params = query.sql_with_params()
+        return hashlib.md5(
+            f'{self.object_list.db}:{sql}:{params!r}'.encode()
+        ).hexdigest()
+
+    @cached_property
+    def count(self):
+        try:
+            signature = self.get_signature()
+        except EmptyResultSet:
+            return 0
+        generations = ':'.join(
+            str(get_generation(namespace)) for namespace in self.namespaces
+        )
+        key = f'count:{generations}:{signature}'
+        count = cache.get(key)
+        if count is not None:
+            return count
+
+        threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+        if threshold is not None:
+            count = self.object_list[:threshold + 1].count()
+            if count <= threshold:
+                cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+                return count
+            estimate = self.estimate_count(signature)
+            if estimate is not None:
+                self.count_estimated = True
+                return estimate
+
+        count = self.object_list.count()
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        cache.set(
+            f'count-estimate:{signature}',
+            (count, time.time()),
+            settings.PAGINATION_COUNT_ESTIMATE_MAX_AGE
+        )
+        return count
+
+    def page(self, number):
+        self.count  # Определяет count_estimated.
+        if not self.count_estimated:
+            return super().page(number)
+        # Оценка может быть меньше точного количества, поэтому границы
+        # страницы и наличие следующей определяются по самой выборке.
+        number = int(number) if str(number).isdigit() else 0
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('На этой странице нет результатов')
+        return EstimatedCountPage(
+            rows[:self.per_page], number, self,
+            has_more=len(rows) > self.per_page
+        )
+
+    def estimate_count(self, signature):
+        known = cache.get(f'count-estimate:{signature}')
+        if known is not None:
+            count, computed_at = known
+            age = time.time() - computed_at
+            if age <= settings.PAGINATION_COUNT_ESTIMATE_MAX_AGE:
+                return count
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        sql, params = self.object_list.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Постраничная пагинация с кешированным количеством объектов.
+
+    Пространства кеша, при изменении которых сбрасывается количество,
+    берутся из атрибута count_namespaces представления. Если количество
+    оценено, в ответ добавляется "count_estimated": true.
+    """
+
+    def django_paginator_class(self, object_list, per_page):
+        return CachedCountPaginator(
+            object_list, per_page, namespaces=self.count_namespaces
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_namespaces = getattr(view, 'count_namespaces', ())
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.page.paginator.count_estimated:
+            response.data['count_estimated'] = True
+        return response
+
+
+class OptionalCursorPagination(CachedCountPagination):
+    """Постраничная пагинация с переходом на курсорную по ?cursor=.
+
+    Курсорный режим не выполняет COUNT(*) и OFFSET, поэтому глубина
+    пролистывания не влияет на время ответа. Курсор хранит позицию в
+    порядке cursor_ordering, поэтому параметры из cursor_excluded_params
+    представления, задающие свой порядок выдачи, вместе с ?cursor=
+    отклоняются с ошибкой 400.
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_query_param in request.query_params:
+            excluded = [
+                param for param in getattr(view, 'cursor_excluded_params', ())
+                if request.query_params.get(param)
+            ]
+            if excluded:
+                raise ValidationError({self.cursor_query_param: (
+                    'Курсорная пагинация не сохраняет порядок выдачи '
+                    f'параметров: {", ".join(excluded)}.'
+                )})
+            self.cursor_paginator = CursorPagination()
+            self.cursor_paginator.cursor_query_param = self.cursor_query_param
+            self.cursor_paginator.ordering = self.cursor_ordering
+            self.cursor_paginator.page_size = self.page_size
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class PubDateOptionalCursorPagination(OptionalCursorPagination):
+    cursor_ordering = ('pub_date', 'id')
@@ -11,7 +11,7 @@ class IsAuthorOrReadOnly(BasePermission):
         if not request.user.is_authenticated:
             return False
         return (
-            obj.author == request.user
+            obj.author_id == request.user.id
             or request.user.role == User.ADMIN
             or request.user.role == User.MODERATOR
         )
@@ -37,3 +37,13 @@ class IsAdminOrReadOnly(BasePermission):
             request.user.role == User.ADMIN
             or request.user.is_superuser
         )
+
+
+class AdminOrPartnerOnly(BasePermission):
+    def has_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+        return (
+            request.user.role in (User.ADMIN, User.PARTNER)
+            or request.user.is_superuser
+        )
@@ -35,6 +35,81 @@ class TitleGetSerializer(serializers.ModelSerializer):
         )
 
 
+def get_title_genres(title_ids):
+    """Жанры произведений одним запросом: {id произведения: [жанры]}."""
+    genres = {}
+    for title_id, name, slug in Genre.objects.filter(
+        titles__in=title_ids
+    ).values_list('titles', 'name', 'slug'):
+        genres.setdefault(title_id, []).append({'name': name, 'slug': slug})
+    return genres
+
+
+class TitleReadListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        rows = list(data)
+        genres = None
+        if 'genre' in self.child.fields:
+            genres = get_title_genres([row['id'] for row in rows])
+        return [self.child.serialize_row(row, genres) for row in rows]
+
+
+class TitleReadSerializer(serializers.BaseSerializer):
+    """Сериализатор для чтения произведений из строк values().
+
+    Выдает то же представление, что и TitleGetSerializer, без механизма
+    полей DRF. Жанры загружаются одним запросом на страницу.
+    """
+
+    value_fields = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'description': ('description',),
+        'genre': (),
+        'category': ('category_id', 'category__name', 'category__slug'),
+    }
+
+    class Meta:
+        list_serializer_class = TitleReadListSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields = dict.fromkeys(self.value_fields)
+
+    @classmethod
+    def get_values(cls, fields=None):
+        """Столбцы для values(), нужные для вывода полей."""
+        values = {'id'}
+        for field in cls.value_fields if fields is None else fields:
+            values.update(cls.value_fields[field])
+        return values
+
+    def to_representation(self, row):
+        genres = None
+        if 'genre' in self.fields:
+            genres = get_title_genres([row['id']])
+        return self.serialize_row(row, genres)
+
+    def serialize_row(self, row, genres):
+        data = {}
+        for field in self.fields:
+            if field == 'rating':
+                rating = row['rating']
+                data['rating'] = None if rating is None else int(rating)
+            elif field == 'genre':
+                data['genre'] = genres.get(row['id'], [])
+            elif field == 'category':
+                data['category'] = None if row['category_id'] is None else {
+                    'name': row['category__name'],
+                    'slug': row['category__slug'],
+                }
+            else:
+                data[field] = row[field]
+        return data
+
+
 class TitlePostSerializer(serializers.ModelSerializer):
     genre = serializers.SlugRelatedField(
         many=True,
@@ -132,6 +207,7 @@ class UserSerializer(serializers.ModelSerializer):
         validators=[
             UniqueValidator(
                 queryset=User.objects.all(),
+                lookup='iexact',
                 message='Это имя уже используется.'
             )
         ]
@@ -142,6 +218,7 @@ class UserSerializer(serializers.ModelSerializer):
         validators=[
             UniqueValidator(
                 queryset=User.objects.all(),
+                lookup='iexact',
                 message='Эта электронная почта '
                 'уже используется.'
             )
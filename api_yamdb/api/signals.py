@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    SimilarTitle,
+    Title,
+    TitleScoreCount
+)
+from reviews.signals import derived_data_changed
+
+from .authentication import forget_user_state
+from .cache import (
+    CACHE_NAMESPACES,
+    CATEGORIES_CACHE_NAMESPACE,
+    COMMENTS_CACHE_NAMESPACE,
+    GENRES_CACHE_NAMESPACE,
+    REVIEWS_CACHE_NAMESPACE,
+    TITLES_CACHE_NAMESPACE,
+    USERS_CACHE_NAMESPACE,
+    bump_generations
+)
+
+User = get_user_model()
+
+SENDER_NAMESPACES = {
+    Title: (TITLES_CACHE_NAMESPACE,),
+    Title.genre.through: (TITLES_CACHE_NAMESPACE,),
+    Genre: (TITLES_CACHE_NAMESPACE, GENRES_CACHE_NAMESPACE),
+    Category: (TITLES_CACHE_NAMESPACE, CATEGORIES_CACHE_NAMESPACE),
+    Review: (TITLES_CACHE_NAMESPACE, REVIEWS_CACHE_NAMESPACE),
+    Comment: (COMMENTS_CACHE_NAMESPACE,),
+    User: (USERS_CACHE_NAMESPACE,),
+    SimilarTitle: (TITLES_CACHE_NAMESPACE,),
+    TitleScoreCount: (TITLES_CACHE_NAMESPACE,),
+}
+
+
+@receiver([post_save, post_delete], sender=Title)
+@receiver([post_save, post_delete], sender=Genre)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Review)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=User)
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_cached_responses(sender, **kwargs):
+    # Поколение меняется после фиксации транзакции и после обработчиков
+    # приложения reviews (оно подключается раньше), иначе параллельный
+    # запрос может сохранить в новое поколение устаревший ответ.
+    namespaces = SENDER_NAMESPACES[sender]
+    transaction.on_commit(lambda: bump_generations(namespaces))
+
+
+@receiver(derived_data_changed)
+def invalidate_derived_data(sender, **kwargs):
+    namespaces = (
+        CACHE_NAMESPACES if sender is None else SENDER_NAMESPACES[sender]
+    )
+    transaction.on_commit(lambda: bump_generations(namespaces))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_state(sender, instance, **kwargs):
+    forget_user_state(instance.pk)
+    transaction.on_commit(lambda: forget_user_state(instance.pk))
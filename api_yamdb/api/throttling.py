@@ -0,0 +1,83 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов скользящим окном.
+
+    Запросы считаются атомарным инкрементом в кеше по фиксированным окнам,
+    а число запросов в скользящем окне оценивается как сумма счетчика
+    текущего окна и доли счетчика предыдущего. Отклоненные запросы тоже
+    учитываются, поэтому непрерывный поток запросов не пропускается.
+    Одному запросу может соответствовать несколько идентификаторов: запрос
+    отклоняется, если лимит превышен хотя бы для одного из них.
+    """
+
+    cache = cache
+
+    def get_rate(self):
+        # Лимиты читаются при каждом запросе, а не при импорте модуля.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_idents(self, request, view):
+        raise NotImplementedError('.get_idents() must be overridden')
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+        previous_weight = 1 - self.elapsed / self.duration
+        allowed = True
+        for ident in self.get_idents(request, view):
+            key = self.cache_format % {'scope': self.scope, 'ident': ident}
+            current = self.increment(f'{key}:{window}')
+            previous = self.cache.get(f'{key}:{window - 1}', 0)
+            if previous * previous_weight + current > self.num_requests:
+                allowed = False
+        return allowed
+
+    def increment(self, key):
+        # Счетчик живет два окна: в следующем окне он нужен как предыдущий.
+        self.cache.add(key, 0, timeout=self.duration * 2)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, 1, timeout=self.duration * 2)
+            return 1
+
+    def wait(self):
+        return self.duration - self.elapsed
+
+    def timer(self):
+        return time.time()
+
+
+class AuthIPThrottle(SlidingWindowThrottle):
+    """Лимит запросов к эндпоинтам аутентификации с одного IP-адреса."""
+
+    scope = 'auth_ip'
+
+    def get_idents(self, request, view):
+        return [self.get_ident(request)]
+
+
+class AuthIdentityThrottle(SlidingWindowThrottle):
+    """Лимит запросов к эндпоинтам аутентификации для username и email."""
+
+    scope = 'auth_identity'
+    ident_fields = ('username', 'email')
+
+    def get_idents(self, request, view):
+        idents = []
+        for field in self.ident_fields:
+            value = request.data.get(field)
+            if isinstance(value, str) and value:
+                digest = hashlib.md5(value.lower().encode()).hexdigest()
+                idents.append(f'{field}:{digest}')
+        return idents
@@ -1,10 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateTimeField
 from rest_framework.permissions import (
     AllowAny,
     IsAuthenticated,
@@ -12,13 +16,48 @@ from rest_framework.permissions import (
 )
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
+from reviews.constants import RECOMMENDATIONS_COUNT, TRENDING_TITLES_COUNT
 from reviews.models import Category, Genre, Review, Title
-
+from reviews.recommendations import get_popular_titles
+from reviews.stats import get_score_stats
+from reviews.trending import decayed_activity
+from users.outbox import queue_email
+
+from .authentication import get_access_token
+from .cache import (
+    CATEGORIES_CACHE_NAMESPACE,
+    COMMENTS_CACHE_NAMESPACE,
+    GENRES_CACHE_NAMESPACE,
+    REVIEWS_CACHE_NAMESPACE,
+    TITLES_CACHE_NAMESPACE,
+    USERS_CACHE_NAMESPACE,
+    ConditionalGetMixin,
+    ConditionalListMixin,
+    VersionedCacheMixin
+)
+from .export import export_titles
+from .facets import (
+    FACETS_QUERY_PARAM,
+    FacetMixin,
+    get_category_facet,
+    get_genre_facet,
+    get_year_facet
+)
+from .fieldsets import (
+    FIELDS_QUERY_PARAM,
+    OMIT_QUERY_PARAM,
+    SparseFieldsetMixin
+)
 from .filters import TitleFilter
+from .pagination import (
+    CachedCountPagination,
+    OptionalCursorPagination,
+    PubDateOptionalCursorPagination
+)
 from .permissions import (
     AdminOnly,
+    AdminOrPartnerOnly,
     IsAdminOrReadOnly,
     IsAuthorOrReadOnly
 )
@@ -27,97 +66,267 @@ from .serializers import (
     CommentSerializer,
     GenreSerializer,
     ReviewSerializer,
-    TitleGetSerializer,
     TitlePostSerializer,
+    TitleReadSerializer,
     TokenSerializer,
     UserMeSerializer,
     UsernameEmailSreializer,
     UserSerializer
 )
+from .throttling import AuthIdentityThrottle, AuthIPThrottle
 
 
 User = get_user_model()
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class NestedResourceMixin:
+    """Загружает родительские объекты вложенного маршрута.
+
+    Отзыв загружается вместе с произведением одним запросом по обоим
+    идентификаторам маршрута. Результат запоминается на время запроса.
+    """
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs['title_id']
+            )
+        return self._title
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                pk=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id']
+            )
+            self._title = self._review.title
+        return self._review
+
+
+class CommentViewSet(
+    NestedResourceMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet
+):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
+    pagination_class = PubDateOptionalCursorPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    etag_namespaces = (COMMENTS_CACHE_NAMESPACE, USERS_CACHE_NAMESPACE)
+    etag_detail_namespaces = (USERS_CACHE_NAMESPACE,)
+    count_namespaces = (COMMENTS_CACHE_NAMESPACE,)
+    sparse_fieldset = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author', 'author__username'),
+        'pub_date': ('pub_date',),
+    }
+    sparse_select_related = {'author': 'author'}
 
     def get_queryset(self):
-        title_id = self.kwargs['title_id']
-        if not Title.objects.filter(
-            id=title_id
-        ).exists():
-            return Response(
-                f'Произведения с id = {title_id} не существует',
-                status=status.HTTP_404_NOT_FOUND
-            )
-        return self.__get_request_review().comments.select_related(
-            'author'
-        ).all()
+        return self.get_review().comments.select_related('author').all()
 
     def perform_create(self, serializer):
         serializer.save(
             author=self.request.user,
-            review=self.__get_request_review()
-        )
-
-    def __get_request_review(self):
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs['review_id']
+            review=self.get_review()
         )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    NestedResourceMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet
+):
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
+    pagination_class = PubDateOptionalCursorPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    etag_namespaces = (REVIEWS_CACHE_NAMESPACE, USERS_CACHE_NAMESPACE)
+    etag_detail_namespaces = (USERS_CACHE_NAMESPACE,)
+    count_namespaces = (REVIEWS_CACHE_NAMESPACE,)
+    sparse_fieldset = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author', 'author__username'),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+    sparse_select_related = {'author': 'author'}
 
     def get_queryset(self):
-        return self.__get_request_title().reviews.select_related(
-            'author'
-        ).all()
+        return self.get_title().reviews.select_related('author').all()
 
     def create(self, request, *args, **kwargs):
-        if request.user.reviews.filter(
-            title=self.__get_request_title()
-        ).exists():
+        # Повторный отзыв отклоняет ограничение only_one_review_to_title.
+        try:
+            with transaction.atomic():
+                return super().create(request, *args, **kwargs)
+        except IntegrityError:
+            if not self.get_title().reviews.filter(
+                author=request.user
+            ).exists():
+                raise
             return Response(
                 'Нельзя оставить более одного отзыва на произведение',
                 status=status.HTTP_400_BAD_REQUEST
             )
-        return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(
             author=self.request.user,
-            title=self.__get_request_title()
-        )
-
-    def __get_request_title(self):
-        return get_object_or_404(
-            Title,
-            pk=self.kwargs['title_id']
+            title=self.get_title()
         )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).select_related('category').prefetch_related('genre')
+class TitleViewSet(
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    VersionedCacheMixin,
+    FacetMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
 
-    serializer_class = TitleGetSerializer
+    serializer_class = TitleReadSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = OptionalCursorPagination
+    # Результаты поиска упорядочены по релевантности.
+    cursor_excluded_params = ('search',)
     filterset_class = TitleFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_namespace = TITLES_CACHE_NAMESPACE
+    cache_query_params = (
+        'page', 'cursor', FIELDS_QUERY_PARAM, OMIT_QUERY_PARAM,
+        FACETS_QUERY_PARAM
+    )
+    etag_namespaces = (TITLES_CACHE_NAMESPACE,)
+    etag_detail_namespaces = (
+        GENRES_CACHE_NAMESPACE,
+        CATEGORIES_CACHE_NAMESPACE
+    )
+    count_namespaces = (
+        TITLES_CACHE_NAMESPACE,
+        GENRES_CACHE_NAMESPACE,
+        CATEGORIES_CACHE_NAMESPACE
+    )
+    sparse_fieldset = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'description': ('description',),
+        'genre': (),
+        'category': ('category', 'category__name', 'category__slug'),
+    }
+    sparse_select_related = {'category': 'category'}
+    sparse_prefetch_related = {'genre': 'genre'}
+    facets = {
+        'genre': get_genre_facet,
+        'category': get_category_facet,
+        'year': get_year_facet,
+    }
+    facet_namespaces = count_namespaces
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[AdminOrPartnerOnly]
+    )
+    def export(self, request):
+        """Выгрузка каталога в формате NDJSON.
+
+        ?since= оставляет произведения, измененные после указанного
+        времени, ?reviews=1 добавляет к произведениям их отзывы.
+        """
+        queryset = Title.objects.all()
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = DateTimeField().to_internal_value(since)
+            except ValidationError as error:
+                raise ValidationError({'since': error.detail})
+            queryset = queryset.filter(updated_at__gt=since)
+        return StreamingHttpResponse(
+            export_titles(
+                queryset,
+                include_reviews=request.query_params.get('reviews') in (
+                    '1', 'true'
+                )
+            ),
+            content_type='application/x-ndjson; charset=utf-8'
+        )
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """Произведения с наибольшим числом недавних отзывов.
+
+        Принимает те же фильтры, что и список произведений. Удаление
+        отзыва вычитает его вклад; после массовой загрузки отзывов
+        популярность пересчитывает rebuild_trending.
+        """
+        filterset = TitleFilter(
+            request.query_params,
+            queryset=Title.objects.filter(trending_score__isnull=False),
+            request=request
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        rows = list(filterset.qs.order_by('-trending_score', 'pk').values(
+            *TitleReadSerializer.get_values(), 'trending_score'
+        )[:TRENDING_TITLES_COUNT])
+        data = TitleReadSerializer(rows, many=True).data
+        now = timezone.now()
+        for title, row in zip(data, rows):
+            title['trending'] = decayed_activity(row['trending_score'], now)
+        return Response(data)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Гистограмма оценок произведения."""
+        return self.cached_response(self.get_stats, request, pk)
+
+    def get_stats(self, request, pk):
+        get_object_or_404(Title.objects.only('pk'), pk=pk)
+        return Response(get_score_stats(pk))
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Похожие произведения по убыванию сходства."""
+        return self.cached_response(self.get_similar, request, pk)
+
+    def get_similar(self, request, pk):
+        get_object_or_404(Title.objects.only('pk'), pk=pk)
+        rows = list(Title.objects.filter(
+            similar_to__title_id=pk
+        ).order_by('similar_to__rank').values(
+            *TitleReadSerializer.get_values(),
+            similarity=F('similar_to__similarity')
+        ))
+        data = TitleReadSerializer(rows, many=True).data
+        for title, row in zip(data, rows):
+            title['similarity'] = row['similarity']
+        return Response(data)
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
-            return TitleGetSerializer
+            return TitleReadSerializer
         return TitlePostSerializer
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in ['list', 'retrieve']:
+            # Строки для TitleReadSerializer выбираются без создания моделей.
+            queryset = queryset.prefetch_related(None).values(
+                *TitleReadSerializer.get_values(self.get_sparse_fields())
+            )
+        return queryset
+
 
 class CreateDestroyListMixin(
     viewsets.mixins.CreateModelMixin,
@@ -128,26 +337,32 @@ class CreateDestroyListMixin(
     pass
 
 
-class GenreViewSet(CreateDestroyListMixin):
+class GenreViewSet(ConditionalListMixin, CreateDestroyListMixin):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'slug'
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
+    etag_namespaces = (GENRES_CACHE_NAMESPACE,)
 
 
-class CategoryViewSet(CreateDestroyListMixin):
+class CategoryViewSet(ConditionalListMixin, CreateDestroyListMixin):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'slug'
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
+    etag_namespaces = (CATEGORIES_CACHE_NAMESPACE,)
 
 
 class SignUpView(APIView):
+    # Без аутентификации: заголовок Authorization не должен приводить
+    # к обращению к базе до проверки лимитов.
+    authentication_classes = ()
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthIdentityThrottle]
 
     def post(self, request):
         serializer = UsernameEmailSreializer(data=request.data)
@@ -158,65 +373,79 @@ class SignUpView(APIView):
         username = serializer.validated_data.get('username')
         email = serializer.validated_data.get('email')
 
-        existing_user_with_email = User.objects.filter(
-            email=email).exclude(username=username).first()
-        if existing_user_with_email:
+        user, error = self.find_user(username, email)
+        if user is None and error is None:
+            try:
+                with transaction.atomic():
+                    user = User.objects.create_user(
+                        username=username,
+                        email=email
+                    )
+            except IntegrityError:
+                # Пользователь создан параллельным запросом.
+                user, error = self.find_user(username, email)
+        if user is None:
             return Response(
-                {'email': 'Этот email уже используется'},
+                error or {'username': 'Этот username уже используется'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        existing_user_with_username = User.objects.filter(
-            username=username).exclude(email=email).first()
-        if existing_user_with_username:
-            return Response(
-                {'email': 'Этот username уже используется'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        existing_user = User.objects.filter(
-            username=username, email=email).first()
-        if existing_user:
-            code = default_token_generator.make_token(existing_user)
-            self.send_confirmation_code(
-                existing_user.email, code, existing_user.username)
-            return Response(
-                {'username': username, 'email': email},
-                status=status.HTTP_200_OK
-            )
-
-        user = User.objects.create_user(
-            username=username,
-            email=email
-        )
-        code = default_token_generator.make_token(user)
-        self.send_confirmation_code(email, code, username)
 
+        self.send_confirmation_code(user)
         return Response({'username': username, 'email': email},
                         status=status.HTTP_200_OK)
 
-    def send_confirmation_code(self, email, code, username):
-        send_mail(
+    def find_user(self, username, email):
+        """Ищет пользователя с указанными username и email одним запросом.
+
+        Существующим считается только пользователь с точно такими же
+        username и email: по ним же выдается токен. Возвращает
+        пользователя и ошибку, если username или email с точностью до
+        регистра заняты другим пользователем.
+        """
+        username_lower = username.lower()
+        email_lower = email.lower()
+        # Без ограничения числа строк: точное совпадение не должно
+        # отсекаться строками, совпадающими только без учета регистра.
+        users = list(User.objects.filter(
+            Q(username_lower=username_lower) | Q(email_lower=email_lower)
+        ))
+        for user in users:
+            if user.username == username and user.email == email:
+                return user, None
+        if any(user.email_lower == email_lower for user in users):
+            return None, {'email': 'Этот email уже используется'}
+        if users:
+            return None, {'username': 'Этот username уже используется'}
+        return None, None
+
+    def send_confirmation_code(self, user):
+        code = default_token_generator.make_token(user)
+        queue_email(
+            recipient=user.email,
             subject='Ваш код подтверждения',
-            message=f'Здравствуйте, {username}! Ваш код подтверждения: {code}',
-            from_email=None,
-            recipient_list=[email],
-            fail_silently=False,
+            body=(
+                f'Здравствуйте, {user.username}! '
+                f'Ваш код подтверждения: {code}'
+            ),
+            dedupe_key=f'confirmation:{user.pk}'
         )
 
 
 class TokenObtainView(APIView):
+    authentication_classes = ()
     permission_classes = [AllowAny]
+    throttle_classes = [AuthIPThrottle, AuthIdentityThrottle]
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        token = AccessToken.for_user(serializer.validated_data.get('user'))
+        token = get_access_token(serializer.validated_data.get('user'))
         return Response({
             'token': str(token),
         }, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [AdminOnly]
@@ -224,6 +453,33 @@ class UserViewSet(viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'patch', 'delete']
     filter_backends = [filters.SearchFilter]
     search_fields = ['username']
+    pagination_class = CachedCountPagination
+    count_namespaces = (USERS_CACHE_NAMESPACE,)
+    sparse_fieldset = {
+        field: (field,) for field in (
+            'username', 'email', 'first_name', 'last_name', 'bio', 'role'
+        )
+    }
+
+    def save_user(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            # Имя или email занял параллельный запрос: повторная проверка
+            # вернет ту же ошибку 400, что и без гонки.
+            self.get_serializer(
+                serializer.instance,
+                data=self.request.data,
+                partial=serializer.partial
+            ).is_valid(raise_exception=True)
+            raise
+
+    def perform_create(self, serializer):
+        self.save_user(serializer)
+
+    def perform_update(self, serializer):
+        self.save_user(serializer)
 
     @action(
         detail=False,
@@ -232,7 +488,8 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_class=UserMeSerializer
     )
     def me(self, request):
-        user = request.user
+        # request.user содержит только поля для проверки прав доступа.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -240,5 +497,33 @@ class UserViewSet(viewsets.ModelViewSet):
             serializer = self.get_serializer(user, data=request.data,
                                              partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            self.save_user(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='me/recommendations',
+        permission_classes=[IsAuthenticated]
+    )
+    def recommendations(self, request):
+        """Непросмотренные произведения по убыванию ожидаемой оценки.
+
+        Если рекомендации еще не рассчитаны, выводятся популярные
+        произведения жанров, которые оценивал пользователь.
+        """
+        values = TitleReadSerializer.get_values()
+        seen = Review.objects.filter(author=request.user).values('title_id')
+        rows = list(Title.objects.filter(
+            recommended_to__user=request.user
+        ).exclude(pk__in=seen).order_by('recommended_to__rank').values(
+            *values, predicted_score=F('recommended_to__predicted_score')
+        ))
+        if not rows:
+            rows = list(get_popular_titles(request.user).values(
+                *values
+            )[:RECOMMENDATIONS_COUNT])
+        data = TitleReadSerializer(rows, many=True).data
+        for title, row in zip(data, rows):
+            title['predicted_score'] = row.get('predicted_score')
+        return Response(data)
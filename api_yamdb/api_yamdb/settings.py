@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -19,14 +20,15 @@ INSTALLED_APPS = [
     'django_filters',
     'rest_framework',
     'rest_framework_simplejwt',
-    'api',
     'reviews',
     'users',
+    'api',
 ]
 
 AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
+    'api.middleware.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -36,6 +38,28 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Число SQL-запросов и время работы с базой в заголовке Server-Timing
+# и в логе api.sql для каждого запроса. Включается переменной окружения
+# YAMDB_SQL_INSTRUMENTATION=1.
+SQL_INSTRUMENTATION = os.getenv('YAMDB_SQL_INSTRUMENTATION') == '1'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.sql': {
+            'handlers': ['console'],
+            'level': 'INFO' if SQL_INSTRUMENTATION else 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -98,12 +122,40 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 60 * 15
+
+# Количество объектов в постраничных списках кешируется до изменения
+# данных. Для списков больше порога (None - без оценки) после изменений
+# отдается последнее точное количество не старше
+# PAGINATION_COUNT_ESTIMATE_MAX_AGE секунд с флагом count_estimated.
+PAGINATION_COUNT_CACHE_TIMEOUT = 60 * 15
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 10000
+PAGINATION_COUNT_ESTIMATE_MAX_AGE = 60 * 5
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 DEFAULT_FROM_EMAIL = 'automessage@yambd.com'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Очередь исходящих писем: 'thread' - отправка фоновым потоком, который
+# сам планирует повторные попытки, 'immediate' - сразу после фиксации
+# транзакции, 'command' - только командой send_emails. В режимах
+# 'immediate' и 'command' для повторных попыток нужен send_emails --loop.
+EMAIL_OUTBOX_DELIVERY = 'thread'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+EMAIL_OUTBOX_LEASE = 60 * 5
+EMAIL_OUTBOX_DEDUPE_WINDOW = 60 * 5
+
 # там, где пост запросы к аутентификации добавить allowAny
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
@@ -115,13 +167,23 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+
+    # Лимиты эндпоинтов регистрации и получения токена: с одного IP-адреса
+    # и для одного username или email.
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': '30/min',
+        'auth_identity': '5/min',
+    },
 }
 
+# Сколько секунд хранится в кеше роль пользователя для проверки токенов.
+AUTH_USER_CACHE_TIMEOUT = 60
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
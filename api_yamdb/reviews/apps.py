@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TitlesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
     verbose_name = 'Сервис Yamdb'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import create_title_search_triggers
+
+        post_migrate.connect(create_title_search_triggers, sender=self)
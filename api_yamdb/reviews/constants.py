@@ -6,3 +6,22 @@ MIN_SCORE = 0
 
 TITLE_LENGTH = 256
 """Длина поля name моделей."""
+
+SIMILAR_TITLES_COUNT = 20
+"""Сколько похожих произведений хранится для каждого произведения."""
+
+RECOMMENDATIONS_COUNT = 20
+"""Сколько рекомендаций хранится для каждого пользователя."""
+
+TRENDING_HALF_LIFE = 3 * 24 * 60 * 60
+"""Через сколько секунд вклад отзыва в популярность уменьшается вдвое."""
+
+TRENDING_TITLES_COUNT = 20
+"""Длина списка популярных сейчас произведений."""
+
+RANKING_PRIOR_WEIGHT = 10
+"""Сколько условных оценок добавляется к оценкам произведения в рейтинге
+для сортировки."""
+
+RANKING_PRIOR_MEAN = (MIN_SCORE + MAX_SCORE) / 2
+"""Значение условных оценок."""
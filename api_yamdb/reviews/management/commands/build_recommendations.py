@@ -0,0 +1,108 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.constants import RECOMMENDATIONS_COUNT
+from reviews.models import Recommendation
+from reviews.recommendations import (
+    get_user_scores,
+    load_neighbours,
+    predict_scores
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Расчет персональных рекомендаций по похожим произведениям'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=RECOMMENDATIONS_COUNT,
+            help='Сколько рекомендаций сохранять для пользователя'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество пользователей, обрабатываемых за один проход'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить прерванный расчет с последнего сохраненного '
+                 'пользователя'
+        )
+
+    def handle(self, *args, **options):
+        computed_at, last_id = timezone.now(), 0
+        if options['resume']:
+            computed_at, last_id = self.get_checkpoint(computed_at)
+        # Похожие произведения рассчитывает build_similar_titles.
+        neighbours = load_neighbours()
+        started = time.perf_counter()
+        processed = written = 0
+        while True:
+            user_ids = list(
+                User.objects.filter(pk__gt=last_id).order_by(
+                    'pk'
+                ).values_list('pk', flat=True)[:options['chunk_size']]
+            )
+            if not user_ids:
+                break
+            scores = get_user_scores(user_ids)
+            recommendations = [
+                Recommendation(
+                    user_id=user_id,
+                    title_id=title_id,
+                    rank=rank,
+                    predicted_score=predicted,
+                    computed_at=computed_at
+                )
+                for user_id in user_ids
+                for rank, (title_id, predicted) in enumerate(
+                    predict_scores(
+                        scores.get(user_id), neighbours, options['count']
+                    ),
+                    1
+                )
+            ]
+            # Проход сохраняется целиком, поэтому после сбоя расчет
+            # продолжается за последним пользователем с рекомендациями.
+            with transaction.atomic():
+                Recommendation.objects.filter(user_id__in=user_ids).delete()
+                Recommendation.objects.bulk_create(recommendations)
+            processed += len(user_ids)
+            written += len(recommendations)
+            last_id = user_ids[-1]
+            elapsed = max(time.perf_counter() - started, 1e-6)
+            self.stdout.write(
+                f'Пользователи до {last_id}: {processed} за {elapsed:.2f} с '
+                f'({processed / elapsed:.0f} пользователей/с)'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Рекомендации рассчитаны для {processed} пользователей, '
+            f'сохранено {written}'
+        ))
+
+    def get_checkpoint(self, default):
+        """Время и последний пользователь прерванного расчета."""
+        computed_at = Recommendation.objects.aggregate(
+            last=Max('computed_at')
+        )['last']
+        if computed_at is None:
+            return default, 0
+        last_id = Recommendation.objects.filter(
+            computed_at=computed_at
+        ).aggregate(last=Max('user_id'))['last']
+        self.stdout.write(
+            f'Продолжение расчета от {computed_at:%Y-%m-%d %H:%M:%S} '
+            f'после пользователя {last_id}'
+        )
+        return computed_at, last_id
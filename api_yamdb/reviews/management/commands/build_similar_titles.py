@@ -0,0 +1,124 @@
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.constants import SIMILAR_TITLES_COUNT
+from reviews.models import SimilarTitle, Title
+from reviews.signals import derived_data_changed
+from reviews.similarity import (
+    ADJUSTED_COSINE,
+    COSINE,
+    ScoreMatrix,
+    iter_neighbours
+)
+
+
+class Command(BaseCommand):
+    help = 'Расчет похожих произведений по совместным оценкам авторов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=SIMILAR_TITLES_COUNT,
+            help='Сколько похожих произведений сохранять'
+        )
+        parser.add_argument(
+            '--metric',
+            choices=(ADJUSTED_COSINE, COSINE),
+            default=ADJUSTED_COSINE,
+            help='Мера сходства'
+        )
+        parser.add_argument(
+            '--min-common',
+            type=int,
+            default=2,
+            help='Минимальное число авторов, оценивших оба произведения'
+        )
+        parser.add_argument(
+            '--block-size',
+            type=int,
+            default=500,
+            help='Количество произведений в одном блоке расчета'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество процессов расчета'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Пересчитать только произведения, измененные после '
+                 'предыдущего расчета'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        computed_at = timezone.now()
+        titles = Title.objects.order_by('pk')
+        if options['incremental']:
+            # Изменение отзывов обновляет updated_at произведения.
+            since = SimilarTitle.objects.aggregate(
+                since=Max('computed_at')
+            )['since']
+            if since is not None:
+                titles = titles.filter(updated_at__gt=since)
+        title_ids = list(titles.values_list('pk', flat=True))
+
+        matrix = ScoreMatrix.load(options['metric'])
+        loaded = time.perf_counter()
+        self.stdout.write(
+            f'Матрица оценок: {len(matrix.user_titles)} оценок '
+            f'за {loaded - started:.2f} с'
+        )
+
+        rows = (
+            SimilarTitle(
+                title_id=title_id,
+                similar_id=similar_id,
+                rank=rank,
+                similarity=similarity,
+                computed_at=computed_at
+            )
+            for title_id, neighbours in iter_neighbours(
+                matrix,
+                title_ids,
+                options['top_k'],
+                options['min_common'],
+                options['block_size'],
+                options['workers']
+            )
+            for rank, (similar_id, similarity) in enumerate(neighbours, 1)
+        )
+        written = 0
+        with transaction.atomic():
+            if options['incremental']:
+                # Удаляются соседи тех же произведений, что пересчитаны:
+                # повторная выборка могла бы захватить новые изменения.
+                for start in range(0, len(title_ids), options['block_size']):
+                    SimilarTitle.objects.filter(title_id__in=title_ids[
+                        start:start + options['block_size']
+                    ]).delete()
+            else:
+                SimilarTitle.objects.all().delete()
+            while True:
+                batch = list(islice(rows, options['block_size']))
+                if not batch:
+                    break
+                SimilarTitle.objects.bulk_create(batch)
+                written += len(batch)
+        derived_data_changed.send(sender=SimilarTitle)
+
+        elapsed = max(time.perf_counter() - loaded, 1e-6)
+        self.stdout.write(self.style.SUCCESS(
+            f'Похожие произведения рассчитаны для {len(title_ids)} '
+            f'произведений за {elapsed:.2f} с '
+            f'({len(title_ids) / elapsed:.0f} произведений/с), '
+            f'сохранено {written} пар'
+        ))
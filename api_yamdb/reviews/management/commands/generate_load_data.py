@@ -0,0 +1,272 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.constants import MAX_SCORE, MIN_SCORE
+from reviews.management.utils import keep_auto_now_add, refresh_derived_data
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+WORDS = (
+    'время', 'город', 'дорога', 'жизнь', 'звезда', 'история', 'книга',
+    'любовь', 'мир', 'море', 'ночь', 'песня', 'путь', 'река', 'свет',
+    'сердце', 'сон', 'тайна', 'тень', 'утро', 'ветер', 'война', 'дом',
+    'зима', 'лето', 'небо', 'огонь', 'память', 'солнце', 'тишина',
+)
+
+MAX_PAIR_ATTEMPTS = 20
+"""Во сколько раз число попыток может превышать число отзывов."""
+
+
+def zipf_cum_weights(size, exponent):
+    """Накопленные веса распределения Ципфа для рангов 1..size."""
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, size + 1)
+    ))
+
+
+class Command(BaseCommand):
+    help = 'Генерация синтетических данных для нагрузочного тестирования'
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 1000),
+            ('categories', 10),
+            ('genres', 30),
+            ('titles', 10000),
+            ('reviews', 100000),
+            ('comments', 100000),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Количество создаваемых объектов ({default})'
+            )
+        parser.add_argument(
+            '--max-genres-per-title',
+            type=int,
+            default=3,
+            help='Максимальное число жанров у произведения'
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа для популярности'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='За сколько последних дней распределяются даты публикации'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.zipf = options['zipf']
+        self.now = timezone.now()
+        self.period = timedelta(days=options['days']).total_seconds()
+
+        user_ids = self.create_users(options['users'])
+        category_ids = self.create_named(
+            Category, 'category', options['categories']
+        )
+        genre_ids = self.create_named(Genre, 'genre', options['genres'])
+        title_ids = self.create_titles(options['titles'], category_ids)
+        self.create_genre_links(
+            title_ids, genre_ids, options['max_genres_per_title']
+        )
+        with keep_auto_now_add(Review, 'pub_date'), \
+                keep_auto_now_add(Comment, 'pub_date'):
+            review_ids = self.create_reviews(
+                options['reviews'], user_ids, title_ids
+            )
+            self.create_comments(options['comments'], user_ids, review_ids)
+
+        refresh_derived_data(self.stdout)
+        self.stdout.write(self.style.SUCCESS('Данные сгенерированы'))
+
+    def next_ids(self, model, count):
+        start = (model.objects.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
+        return list(range(start, start + count))
+
+    def popularity(self, ids):
+        """Перемешивает объекты и возвращает веса их популярности."""
+        ids = list(ids)
+        self.rng.shuffle(ids)
+        return ids, zipf_cum_weights(len(ids), self.zipf)
+
+    def random_text(self, min_words, max_words):
+        return ' '.join(self.rng.choices(
+            WORDS, k=self.rng.randint(min_words, max_words)
+        )).capitalize()
+
+    def random_date(self):
+        return self.now - timedelta(seconds=self.rng.random() * self.period)
+
+    def write(self, model, objects):
+        """Сохраняет объекты пакетами по мере их генерации."""
+        started = time.perf_counter()
+        written = 0
+        objects = iter(objects)
+        with transaction.atomic():
+            while True:
+                batch = list(islice(objects, self.batch_size))
+                if not batch:
+                    break
+                model.objects.bulk_create(batch)
+                written += len(batch)
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        self.stdout.write(
+            f'{model._meta.label}: {written} за '
+            f'{elapsed:.2f} с ({written / elapsed:.0f} строк/с)'
+        )
+        return written
+
+    def create_users(self, count):
+        ids = self.next_ids(User, count)
+        password = make_password(None)
+        self.write(User, (
+            User(
+                id=user_id,
+                username=f'load_user_{user_id}',
+                email=f'load_user_{user_id}@yamdb.fake',
+                username_lower=f'load_user_{user_id}',
+                email_lower=f'load_user_{user_id}@yamdb.fake',
+                password=password,
+            )
+            for user_id in ids
+        ))
+        return ids
+
+    def create_named(self, model, prefix, count):
+        ids = self.next_ids(model, count)
+        self.write(model, (
+            model(
+                id=obj_id,
+                name=self.random_text(1, 2),
+                slug=f'load-{prefix}-{obj_id}'
+            )
+            for obj_id in ids
+        ))
+        return ids
+
+    def create_titles(self, count, category_ids):
+        ids = self.next_ids(Title, count)
+        self.write(Title, self.generate_titles(ids, category_ids))
+        return ids
+
+    def generate_titles(self, ids, category_ids):
+        categories, weights = self.popularity(category_ids)
+        for title_id in ids:
+            yield Title(
+                id=title_id,
+                name=self.random_text(1, 4),
+                year=self.rng.randint(1900, self.now.year),
+                description=self.random_text(5, 30),
+                category_id=(
+                    self.rng.choices(categories, cum_weights=weights)[0]
+                    if categories else None
+                ),
+            )
+
+    def create_genre_links(self, title_ids, genre_ids, max_per_title):
+        if genre_ids:
+            self.write(Title.genre.through, self.generate_genre_links(
+                title_ids, genre_ids, max_per_title
+            ))
+
+    def generate_genre_links(self, title_ids, genre_ids, max_per_title):
+        genres, weights = self.popularity(genre_ids)
+        for title_id in title_ids:
+            linked = set(self.rng.choices(
+                genres,
+                cum_weights=weights,
+                k=self.rng.randint(1, max_per_title)
+            ))
+            for genre_id in linked:
+                yield Title.genre.through(
+                    title_id=title_id, genre_id=genre_id
+                )
+
+    def create_reviews(self, count, user_ids, title_ids):
+        if not user_ids or not title_ids:
+            return []
+        ids = self.next_ids(Review, count)
+        created = self.write(
+            Review, self.generate_reviews(ids, user_ids, title_ids)
+        )
+        if created < count:
+            self.stdout.write(self.style.WARNING(
+                f'Создано {created} отзывов из {count}: '
+                'не хватает уникальных пар автор-произведение'
+            ))
+        return ids[:created]
+
+    def generate_reviews(self, ids, user_ids, title_ids):
+        users, user_weights = self.popularity(user_ids)
+        titles, title_weights = self.popularity(title_ids)
+        count = len(ids)
+        seen = set()
+        attempts = 0
+        while len(seen) < count and attempts < count * MAX_PAIR_ATTEMPTS:
+            size = min(self.batch_size, count - len(seen))
+            attempts += size
+            for pair in zip(
+                self.rng.choices(users, cum_weights=user_weights, k=size),
+                self.rng.choices(titles, cum_weights=title_weights, k=size)
+            ):
+                # Ограничение only_one_review_to_title: одна пара
+                # автор-произведение встречается не больше одного раза.
+                if pair in seen:
+                    continue
+                yield Review(
+                    id=ids[len(seen)],
+                    author_id=pair[0],
+                    title_id=pair[1],
+                    text=self.random_text(5, 40),
+                    score=self.rng.randint(MIN_SCORE, MAX_SCORE),
+                    pub_date=self.random_date(),
+                )
+                seen.add(pair)
+
+    def create_comments(self, count, user_ids, review_ids):
+        if user_ids and review_ids:
+            self.write(Comment, self.generate_comments(
+                self.next_ids(Comment, count), user_ids, review_ids
+            ))
+
+    def generate_comments(self, ids, user_ids, review_ids):
+        users, user_weights = self.popularity(user_ids)
+        reviews, review_weights = self.popularity(review_ids)
+        for start in range(0, len(ids), self.batch_size):
+            batch_ids = ids[start:start + self.batch_size]
+            for comment_id, author_id, review_id in zip(
+                batch_ids,
+                self.rng.choices(
+                    users, cum_weights=user_weights, k=len(batch_ids)
+                ),
+                self.rng.choices(
+                    reviews, cum_weights=review_weights, k=len(batch_ids)
+                )
+            ):
+                yield Comment(
+                    id=comment_id,
+                    author_id=author_id,
+                    review_id=review_id,
+                    text=self.random_text(3, 20),
+                    pub_date=self.random_date(),
+                )
@@ -1,59 +1,202 @@
 import csv
 import os
+import time
+from itertools import islice
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
-from reviews.models import Category, Genre, Title
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from reviews.management.utils import keep_auto_now_add, refresh_derived_data
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
 
 
 class Command(BaseCommand):
     help = 'Импорт данных из CSV файлов'
 
-    def handle(self, *args, **kwargs):
-        data_dir = os.path.join(settings.BASE_DIR, 'static', 'data')
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV файлами'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество строк, записываемых за один запрос'
+        )
 
-        file_data = self.__get_data_from_file(data_dir, 'category.csv')
-        for row in file_data:
-            Category.objects.update_or_create(
-                slug=row['slug'],
-                defaults={'name': row['name']}
-            )
+    def handle(self, *args, **options):
+        self.data_dir = options['path']
+        self.batch_size = options['batch_size']
+        self.known_ids = {}
+
+        # Файлы перечислены в порядке зависимостей по внешним ключам.
+        sources = (
+            ('users.csv', User, self.build_user, (
+                'username', 'email', 'role', 'bio', 'first_name', 'last_name',
+                *User.LOOKUP_FIELDS.values()
+            )),
+            ('category.csv', Category, self.build_category, (
+                'name', 'slug'
+            )),
+            ('genre.csv', Genre, self.build_genre, ('name', 'slug')),
+            ('titles.csv', Title, self.build_title, (
+                'name', 'year', 'description', 'category'
+            )),
+            ('genre_title.csv', Title.genre.through, self.build_genre_title,
+             None),
+            ('review.csv', Review, self.build_review, (
+                'title', 'author', 'text', 'score', 'pub_date'
+            )),
+            ('comments.csv', Comment, self.build_comment, (
+                'review', 'author', 'text', 'pub_date'
+            )),
+        )
+        with keep_auto_now_add(Review, 'pub_date'), \
+                keep_auto_now_add(Comment, 'pub_date'):
+            for file_name, model, build, update_fields in sources:
+                self.import_file(file_name, model, build, update_fields)
+
+        refresh_derived_data(self.stdout)
+        self.stdout.write(self.style.SUCCESS('Данные успешно импортированы'))
+
+    def import_file(self, file_name, model, build, update_fields):
+        path = os.path.join(self.data_dir, file_name)
+        if not os.path.exists(path):
+            self.stdout.write(self.style.WARNING(f'{file_name}: не найден'))
+            return
+        started = time.perf_counter()
+        imported = skipped = 0
+        with transaction.atomic():
+            rows = self.read_rows(path)
+            while True:
+                chunk = list(islice(rows, self.batch_size))
+                if not chunk:
+                    break
+                objects = [obj for obj in map(build, chunk) if obj is not None]
+                skipped += len(chunk) - len(objects)
+                if objects:
+                    self.save_batch(model, objects, update_fields)
+                    imported += len(objects)
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        self.stdout.write(
+            f'{file_name}: {imported} строк за {elapsed:.2f} с '
+            f'({imported / elapsed:.0f} строк/с), пропущено {skipped}'
+        )
 
-        file_data = self.__get_data_from_file(data_dir, 'genre.csv')
-        for row in file_data:
-            Genre.objects.update_or_create(
-                slug=row['slug'],
-                defaults={'name': row['name']}
+    def read_rows(self, path):
+        with open(path, encoding='utf-8', newline='') as file:
+            yield from csv.DictReader(file)
+
+    def save_batch(self, model, objects, update_fields):
+        if update_fields is None:
+            model.objects.bulk_create(
+                objects, batch_size=self.batch_size, ignore_conflicts=True
             )
+            return
+        existing = set(model.objects.filter(
+            pk__in=[obj.pk for obj in objects]
+        ).values_list('pk', flat=True))
+        model.objects.bulk_create(
+            [obj for obj in objects if obj.pk not in existing],
+            batch_size=self.batch_size
+        )
+        model.objects.bulk_update(
+            [obj for obj in objects if obj.pk in existing],
+            update_fields,
+            batch_size=self.batch_size
+        )
 
-        file_data = self.__get_data_from_file(data_dir, 'titles.csv')
-        for row in file_data:
-            category = Category.objects.filter(
-                id=int(row['category'])
-            ).first()
-            Title.objects.update_or_create(
-                id=int(row['id']),
-                defaults={
-                    'name': row['name'],
-                    'year': int(row['year']),
-                    'description': '',
-                    'category': category
-                }
+    def get_known_ids(self, model):
+        # Файлы импортируются в порядке зависимостей, поэтому к моменту
+        # первого обращения строки модели уже сохранены в базе.
+        if model not in self.known_ids:
+            self.known_ids[model] = set(
+                model.objects.values_list('pk', flat=True).iterator()
             )
+        return self.known_ids[model]
 
-        file_data = self.__get_data_from_file(data_dir, 'genre_title.csv')
-        for row in file_data:
-            title = Title.objects.filter(id=int(row['title_id'])).first()
-            genre = Genre.objects.filter(id=int(row['genre_id'])).first()
-            if title and genre:
-                title.genre.add(genre)
+    def is_known(self, model, value):
+        return value is not None and value in self.get_known_ids(model)
 
-        self.stdout.write(self.style.SUCCESS('Данные успешно импортированы'))
+    def build_user(self, row):
+        user = User(
+            id=int(row['id']),
+            username=row['username'],
+            email=row['email'],
+            role=row.get('role') or User.USER,
+            bio=row.get('bio', ''),
+            first_name=row.get('first_name', ''),
+            last_name=row.get('last_name', ''),
+            password=make_password(None),
+        )
+        user.fill_lookup_fields()
+        return user
+
+    def build_category(self, row):
+        return Category(id=int(row['id']), name=row['name'], slug=row['slug'])
+
+    def build_genre(self, row):
+        return Genre(id=int(row['id']), name=row['name'], slug=row['slug'])
+
+    def build_title(self, row):
+        category_id = int(row['category']) if row.get('category') else None
+        if not self.is_known(Category, category_id):
+            category_id = None
+        return Title(
+            id=int(row['id']),
+            name=row['name'],
+            year=int(row['year']),
+            description=row.get('description', ''),
+            category_id=category_id,
+        )
+
+    def build_genre_title(self, row):
+        title_id = int(row['title_id'])
+        genre_id = int(row['genre_id'])
+        if not (
+            self.is_known(Title, title_id) and self.is_known(Genre, genre_id)
+        ):
+            return None
+        return Title.genre.through(
+            id=int(row['id']), title_id=title_id, genre_id=genre_id
+        )
+
+    def build_review(self, row):
+        title_id = int(row['title_id'])
+        author_id = int(row['author'])
+        if not (
+            self.is_known(Title, title_id) and self.is_known(User, author_id)
+        ):
+            return None
+        return Review(
+            id=int(row['id']),
+            title_id=title_id,
+            author_id=author_id,
+            text=row['text'],
+            score=int(row['score']),
+            pub_date=parse_datetime(row['pub_date']),
+        )
 
-    def __get_data_from_file(self, data_dir, file_name):
-        with open(
-            file=os.path.join(data_dir, file_name),
-            encoding='utf-8'
-        ) as file:
-            data = csv.DictReader(file)
-        return data
+    def build_comment(self, row):
+        review_id = int(row['review_id'])
+        author_id = int(row['author'])
+        if not (
+            self.is_known(Review, review_id)
+            and self.is_known(User, author_id)
+        ):
+            return None
+        return Comment(
+            id=int(row['id']),
+            review_id=review_id,
+            author_id=author_id,
+            text=row['text'],
+            pub_date=parse_datetime(row['pub_date']),
+        )
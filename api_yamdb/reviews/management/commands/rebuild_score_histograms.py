@@ -0,0 +1,43 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import TitleScoreCount
+from reviews.signals import derived_data_changed
+from reviews.stats import get_score_counts
+
+
+class Command(BaseCommand):
+    help = 'Пересчет гистограмм оценок произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество корзин, записываемых за один запрос'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # Все корзины считаются одним групповым запросом по отзывам.
+        rows = get_score_counts().iterator()
+        written = 0
+        with transaction.atomic():
+            TitleScoreCount.objects.all().delete()
+            while True:
+                batch = [
+                    TitleScoreCount(
+                        title_id=title_id, score=score, count=count
+                    )
+                    for title_id, score, count in islice(rows, batch_size)
+                ]
+                if not batch:
+                    break
+                TitleScoreCount.objects.bulk_create(batch)
+                written += len(batch)
+        derived_data_changed.send(sender=TitleScoreCount)
+        self.stdout.write(self.style.SUCCESS(
+            f'Гистограммы оценок пересчитаны: {written} корзин'
+        ))
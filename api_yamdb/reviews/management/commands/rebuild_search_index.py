@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.search import rebuild_title_search_index
+
+
+class Command(BaseCommand):
+    help = 'Перестроение полнотекстового индекса произведений'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_title_search_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Поисковый индекс перестроен: {count} произведений'
+        ))
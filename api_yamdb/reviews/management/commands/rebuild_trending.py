@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Review, Title
+from reviews.signals import derived_data_changed
+from reviews.trending import activity_level, add_level
+
+
+class Command(BaseCommand):
+    help = 'Пересчет популярности произведений по истории отзывов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество произведений, записываемых за один запрос'
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.batch = []
+        updated = 0
+        # Отзывы читаются один раз в порядке индекса по произведению.
+        reviews = Review.objects.order_by('title_id').values_list(
+            'title_id', 'pub_date'
+        ).iterator(chunk_size=self.batch_size)
+        with transaction.atomic():
+            Title.objects.update(trending_score=None)
+            title_id = score = None
+            for review_title_id, pub_date in reviews:
+                if review_title_id != title_id:
+                    if title_id is not None:
+                        self.save(title_id, score)
+                        updated += 1
+                    title_id, score = review_title_id, None
+                score = add_level(score, activity_level(pub_date))
+            if title_id is not None:
+                self.save(title_id, score)
+                updated += 1
+            self.flush()
+        derived_data_changed.send(sender=Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Популярность пересчитана для {updated} произведений'
+        ))
+
+    def save(self, title_id, score):
+        self.batch.append(Title(pk=title_id, trending_score=score))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        Title.objects.bulk_update(self.batch, ['trending_score'])
+        self.batch = []
@@ -0,0 +1,84 @@
+from math import isclose
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from reviews.signals import derived_data_changed
+
+RATING_FIELDS = ('rating_sum', 'rating_count', 'rating', 'ranking')
+
+
+def values_equal(stored, computed):
+    """Совпадают ли сохраненные значения полей рейтинга с расчетными."""
+    return all(
+        old == new if old is None or new is None
+        else isclose(old, new, rel_tol=1e-9)
+        for old, new in zip(stored, computed)
+    )
+
+
+class Command(BaseCommand):
+    help = 'Пересчет сохраненного рейтинга произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество произведений, обрабатываемых за один проход'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        updated = 0
+        while True:
+            rows = list(
+                Title.objects.filter(pk__gt=last_id).order_by(
+                    'pk'
+                ).values_list('pk', *RATING_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            stats = {
+                row['title_id']: (row['total'], row['count'])
+                for row in Review.objects.filter(
+                    title_id__in=[row[0] for row in rows]
+                ).values('title_id').annotate(
+                    total=Sum('score'), count=Count('id')
+                )
+            }
+            now = timezone.now()
+            titles = []
+            for title_id, *stored in rows:
+                total, count = stats.get(title_id, (0, 0))
+                values = (
+                    total,
+                    count,
+                    total / count if count else None,
+                    Title.get_ranking(total, count),
+                )
+                # Неизмененные произведения не трогаются, чтобы не менять
+                # их updated_at: от него зависят ETag и выгрузка ?since=.
+                if values_equal(stored, values):
+                    continue
+                titles.append(Title(
+                    pk=title_id,
+                    **dict(zip(RATING_FIELDS, values)),
+                    updated_at=now
+                ))
+            if titles:
+                with transaction.atomic():
+                    Title.objects.bulk_update(
+                        titles, [*RATING_FIELDS, 'updated_at']
+                    )
+            updated += len(titles)
+            last_id = rows[-1][0]
+        if updated:
+            derived_data_changed.send(sender=Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {updated} произведений'
+        ))
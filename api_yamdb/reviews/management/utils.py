@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+from django.core.management import call_command
+
+from reviews.signals import derived_data_changed
+
+
+@contextmanager
+def keep_auto_now_add(model, field_name):
+    """Отключает auto_now_add, чтобы сохранить заданные даты."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def refresh_derived_data(stdout=None):
+    """Пересчитывает данные, которые сигналы не обновляют при bulk-записи."""
+    call_command('recalculate_ratings', stdout=stdout)
+    call_command('rebuild_score_histograms', stdout=stdout)
+    call_command('rebuild_trending', stdout=stdout)
+    derived_data_changed.send(sender=None)
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.23 on 2026-10-18 18:30
+
+from django.db import migrations
+
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE reviews_title_fts USING fts5("
+    "name, description, tokenize = 'unicode61 remove_diacritics 2')",
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "SELECT id, replace(replace(name, 'ё', 'е'), 'Ё', 'Е'), "
+    "replace(replace(description, 'ё', 'е'), 'Ё', 'Е') FROM reviews_title",
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def run_sqlite_only(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    # Триггеры синхронизации создаются обработчиком post_migrate
+    # (reviews.search.create_title_search_triggers).
+
+    dependencies = [
+        ('reviews', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sqlite_only(CREATE_SQL), run_sqlite_only(DROP_SQL)
+        ),
+    ]
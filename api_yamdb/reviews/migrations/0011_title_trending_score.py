@@ -0,0 +1,26 @@
+# Generated by Django 3.2.23 on 2026-10-18 18:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='trending_score',
+            field=models.FloatField(editable=False, null=True, verbose_name='Популярность сейчас'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-trending_score'], name='title_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-trending_score'], name='title_category_trending_idx'),
+        ),
+    ]
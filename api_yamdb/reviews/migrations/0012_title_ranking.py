@@ -0,0 +1,40 @@
+# Generated by Django 3.2.23 on 2026-10-18 18:31
+
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+PRIOR_WEIGHT = 10
+PRIOR_MEAN = 5.0
+
+
+def fill_ranking(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(ranking=(
+        (Cast(F('rating_sum'), FloatField()) + PRIOR_WEIGHT * PRIOR_MEAN)
+        / (F('rating_count') + PRIOR_WEIGHT)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='ranking',
+            field=models.FloatField(default=5.0, editable=False, verbose_name='Рейтинг для сортировки'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-ranking'], name='title_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-ranking'], name='title_category_ranking_idx'),
+        ),
+        migrations.RunPython(fill_ranking, migrations.RunPython.noop),
+    ]
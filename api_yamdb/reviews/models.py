@@ -3,7 +3,13 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 
-from .constants import MAX_SCORE, MIN_SCORE, TITLE_LENGTH
+from .constants import (
+    MAX_SCORE,
+    MIN_SCORE,
+    RANKING_PRIOR_MEAN,
+    RANKING_PRIOR_WEIGHT,
+    TITLE_LENGTH
+)
 
 User = get_user_model()
 
@@ -18,6 +24,10 @@ class Category(models.Model):
         unique=True,
         verbose_name='Слаг категории'
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         verbose_name = 'Категория'
@@ -37,6 +47,10 @@ class Genre(models.Model):
         unique=True,
         verbose_name='Слаг жанра'
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         verbose_name = 'Жанр'
@@ -74,14 +88,172 @@ class Title(models.Model):
         null=True,
         verbose_name='Категория произведения'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
+    ranking = models.FloatField(
+        default=RANKING_PRIOR_MEAN,
+        editable=False,
+        verbose_name='Рейтинг для сортировки'
+    )
+    trending_score = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Популярность сейчас'
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
+        indexes = [
+            models.Index(fields=['-ranking'], name='title_ranking_idx'),
+            models.Index(
+                fields=['category', '-ranking'],
+                name='title_category_ranking_idx'
+            ),
+            models.Index(
+                fields=['-trending_score'],
+                name='title_trending_idx'
+            ),
+            models.Index(
+                fields=['category', '-trending_score'],
+                name='title_category_trending_idx'
+            ),
+        ]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def get_ranking(rating_sum, rating_count):
+        """Байесовская средняя оценка: среднее с условными оценками.
+
+        Без них произведение с одной высокой оценкой обгоняло бы
+        произведения с сотнями хороших. Принимает числа или выражения.
+        """
+        return (
+            (rating_sum + RANKING_PRIOR_WEIGHT * RANKING_PRIOR_MEAN)
+            / (rating_count + RANKING_PRIOR_WEIGHT)
+        )
+
+
+class TitleScoreCount(models.Model):
+    """Корзина гистограммы оценок произведения."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(verbose_name='Оценка')
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'],
+                name='title_score_count_unique'
+            )
+        ]
+        verbose_name = 'Оценки произведения'
+        verbose_name_plural = 'Оценки произведений'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} x {self.count}'
+
+
+class SimilarTitle(models.Model):
+    """Произведение, похожее на title, по совместным оценкам авторов.
+
+    Таблица заполняется командой build_similar_titles.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='Произведение'
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_to',
+        verbose_name='Похожее произведение'
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name='Место')
+    similarity = models.FloatField(verbose_name='Сходство')
+    computed_at = models.DateTimeField(verbose_name='Дата расчета')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'rank'],
+                name='similar_title_rank_unique'
+            )
+        ]
+        verbose_name = 'Похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+
+    def __str__(self):
+        return f'{self.title_id} -> {self.similar_id}'
+
+
+class Recommendation(models.Model):
+    """Рекомендованное пользователю произведение.
+
+    Таблица заполняется командой build_recommendations.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name='Пользователь'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='recommended_to',
+        verbose_name='Произведение'
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name='Место')
+    predicted_score = models.FloatField(verbose_name='Ожидаемая оценка')
+    computed_at = models.DateTimeField(verbose_name='Дата расчета')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'rank'],
+                name='recommendation_rank_unique'
+            )
+        ]
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.title_id}'
+
 
 class Review(models.Model):
     text = models.TextField(verbose_name='Текст ревью')
@@ -108,6 +280,10 @@ class Review(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         constraints = [
@@ -116,12 +292,27 @@ class Review(models.Model):
                 name='only_one_review_to_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            )
+        ]
         verbose_name = 'Ревью'
         verbose_name_plural = 'Ревью'
 
     def __str__(self):
         return f'Ревью автора {self.author} к произведению {self.title}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Исходные значения нужны для пересчета рейтинга при изменении.
+        if {'score', 'title_id'} <= instance.__dict__.keys():
+            instance._loaded_score = instance.score
+            instance._loaded_title_id = instance.title_id
+        return instance
+
 
 class Comment(models.Model):
     text = models.TextField(verbose_name='Текст комментария')
@@ -141,8 +332,18 @@ class Comment(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            )
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
@@ -0,0 +1,73 @@
+import heapq
+from collections import defaultdict
+
+from .constants import MAX_SCORE, MIN_SCORE
+from .models import Review, SimilarTitle, Title
+
+
+def load_neighbours():
+    """Похожие произведения из SimilarTitle: title_id -> [(id, сходство)]."""
+    neighbours = defaultdict(list)
+    for title_id, similar_id, similarity in SimilarTitle.objects.values_list(
+        'title_id', 'similar_id', 'similarity'
+    ).iterator():
+        neighbours[title_id].append((similar_id, similarity))
+    return neighbours
+
+
+def predict_scores(scores, neighbours, count):
+    """Top-N непросмотренных произведений по предсказанной оценке.
+
+    scores - оценки пользователя {title_id: score}. Оценка произведения
+    предсказывается как средняя оценка пользователя плюс взвешенное по
+    сходству отклонение его оценок похожих произведений.
+    """
+    if not scores:
+        return []
+    mean = sum(scores.values()) / len(scores)
+    weighted = defaultdict(float)
+    weights = defaultdict(float)
+    for title_id, score in scores.items():
+        deviation = score - mean
+        for similar_id, similarity in neighbours.get(title_id, ()):
+            if similar_id not in scores:
+                weighted[similar_id] += similarity * deviation
+                weights[similar_id] += similarity
+    predictions = (
+        (
+            min(max(mean + weighted[title_id] / weight, MIN_SCORE),
+                MAX_SCORE),
+            weight,
+            title_id
+        )
+        for title_id, weight in weights.items()
+    )
+    return [
+        (title_id, predicted)
+        for predicted, _, title_id in heapq.nlargest(count, predictions)
+    ]
+
+
+def get_user_scores(user_ids):
+    """Оценки пользователей: {user_id: {title_id: score}}."""
+    scores = defaultdict(dict)
+    for author_id, title_id, score in Review.objects.filter(
+        author_id__in=user_ids
+    ).values_list('author_id', 'title_id', 'score').iterator():
+        scores[author_id][title_id] = score
+    return scores
+
+
+def get_popular_titles(user):
+    """Популярные произведения жанров, которые оценивал пользователь.
+
+    Если пользователь еще не писал отзывов, возвращаются самые
+    популярные произведения каталога.
+    """
+    seen = Review.objects.filter(author=user).values('title_id')
+    titles = Title.objects.exclude(pk__in=seen)
+    if Review.objects.filter(author=user).exists():
+        titles = titles.filter(
+            genre__titles__reviews__author=user
+        ).distinct()
+    return titles.order_by('-rating_count', '-rating', 'pk')
@@ -0,0 +1,103 @@
+import re
+
+from django.db import connection, connections
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+"""Полнотекстовый индекс SQLite FTS5 по названию и описанию произведений."""
+
+TITLE_SEARCH_WEIGHTS = (10.0, 1.0)
+"""Веса столбцов name и description при ранжировании BM25."""
+
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+NORMALIZED_SQL = "replace(replace({value}, 'ё', 'е'), 'Ё', 'Е')"
+
+INDEX_ROW_SQL = (
+    f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) '
+    'VALUES (new.id, '
+    f"{NORMALIZED_SQL.format(value='new.name')}, "
+    f"{NORMALIZED_SQL.format(value='new.description')});"
+)
+
+TITLE_SEARCH_TRIGGERS = (
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_insert '
+    'AFTER INSERT ON reviews_title '
+    f'BEGIN {INDEX_ROW_SQL} END',
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_update '
+    'AFTER UPDATE OF name, description ON reviews_title '
+    f'BEGIN DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = old.id; '
+    f'{INDEX_ROW_SQL} END',
+    'CREATE TRIGGER IF NOT EXISTS reviews_title_fts_delete '
+    'AFTER DELETE ON reviews_title '
+    f'BEGIN DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = old.id; END',
+)
+
+
+def normalize_search_text(text):
+    """Приводит ё к е: регистр приводит сам токенизатор unicode61."""
+    return text.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def build_match_query(text):
+    """Строит запрос FTS5: все слова обязательны, с поиском по префиксу.
+
+    Каждое слово берется в кавычки, поэтому спецсимволы синтаксиса FTS5
+    во вводе пользователя не приводят к ошибке запроса.
+    """
+    tokens = SEARCH_TOKEN_PATTERN.findall(normalize_search_text(text))
+    return ' AND '.join(f'"{token}"*' for token in tokens)
+
+
+def search_titles(queryset, text):
+    """Оставляет произведения, подходящие под запрос, по убыванию BM25."""
+    match_query = build_match_query(text)
+    if not match_query:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        return queryset.filter(name__icontains=text)
+    weights = ', '.join(str(weight) for weight in TITLE_SEARCH_WEIGHTS)
+    return queryset.extra(
+        tables=[TITLE_SEARCH_TABLE],
+        where=[
+            f'{TITLE_SEARCH_TABLE}.rowid = reviews_title.id',
+            f'{TITLE_SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match_query],
+        select={'search_rank': f'bm25({TITLE_SEARCH_TABLE}, {weights})'},
+        order_by=['search_rank', 'id'],
+    )
+
+
+def rebuild_title_search_index():
+    """Заполняет индекс заново по текущему содержимому таблицы."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TITLE_SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) '
+            f"SELECT id, {NORMALIZED_SQL.format(value='name')}, "
+            f"{NORMALIZED_SQL.format(value='description')} "
+            'FROM reviews_title'
+        )
+        cursor.execute(
+            f"INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) "
+            "VALUES ('optimize')"
+        )
+        cursor.execute(f'SELECT count(*) FROM {TITLE_SEARCH_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def create_title_search_triggers(using='default', **kwargs):
+    """Создает триггеры синхронизации индекса, если их нет.
+
+    Вызывается после каждой миграции: SQLite пересоздает таблицу
+    reviews_title при изменении ее схемы, и триггеры удаляются вместе
+    со старой таблицей.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        if TITLE_SEARCH_TABLE not in db.introspection.table_names(cursor):
+            return
+        for statement in TITLE_SEARCH_TRIGGERS:
+            cursor.execute(statement)
@@ -0,0 +1,152 @@
+from django.db.models import Avg, Count, F, FloatField, Sum
+from django.db.models.functions import Cast, NullIf
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import Category, Genre, Review, Title, TitleScoreCount
+from .stats import get_score_counts, update_score_count
+from .trending import add_activity, subtract_activity
+
+derived_data_changed = Signal()
+"""Данные пересчитаны массово, в обход сигналов моделей.
+
+Отправляется командами пересчета после записи, в том числе при
+отдельном запуске каждой из них.
+
+sender - модель, данные которой изменились, или None, если
+пересчитано все.
+"""
+
+
+def touch_titles(**filters):
+    """Обновляет updated_at произведений, представление которых изменилось.
+
+    От updated_at зависят ETag произведения и выгрузка ?since=.
+    """
+    Title.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+def update_title_rating(title_id, score_delta, count_delta,
+                        published=None, withdrawn=None):
+    """Атомарно сдвигает сумму и количество оценок произведения.
+
+    published - дата нового отзыва, учитываемого в популярности,
+    withdrawn - дата отзыва, вклад которого из нее вычитается.
+    """
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    fields = {}
+    if published is not None:
+        fields['trending_score'] = add_activity(published)
+    elif withdrawn is not None:
+        fields['trending_score'] = subtract_activity(withdrawn)
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Cast(new_sum, FloatField()) / NullIf(new_count, 0),
+        ranking=Title.get_ranking(Cast(new_sum, FloatField()), new_count),
+        updated_at=timezone.now(),
+        **fields
+    )
+
+
+def recalculate_title_rating(title_id):
+    """Пересчитывает рейтинг произведения по всем его отзывам."""
+    stats = Review.objects.filter(title_id=title_id).aggregate(
+        total=Sum('score'), count=Count('id'), rating=Avg('score')
+    )
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=stats['total'] or 0,
+        rating_count=stats['count'],
+        rating=stats['rating'],
+        ranking=Title.get_ranking(stats['total'] or 0, stats['count']),
+        updated_at=timezone.now(),
+    )
+    TitleScoreCount.objects.filter(title_id=title_id).delete()
+    TitleScoreCount.objects.bulk_create(
+        TitleScoreCount(title_id=title_id, score=score, count=count)
+        for _, score, count in get_score_counts([title_id])
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, update_fields, **kwargs):
+    if raw:
+        return
+    if created:
+        update_title_rating(
+            instance.title_id, instance.score, 1, instance.pub_date
+        )
+        update_score_count(instance.title_id, instance.score, 1)
+    elif not hasattr(instance, '_loaded_score'):
+        recalculate_title_rating(instance.title_id)
+    elif update_fields is None or {'score', 'title'} & set(update_fields):
+        if instance._loaded_title_id == instance.title_id:
+            score_delta = instance.score - instance._loaded_score
+            if score_delta:
+                update_title_rating(instance.title_id, score_delta, 0)
+            else:
+                touch_titles(pk=instance.title_id)
+        else:
+            update_title_rating(
+                instance._loaded_title_id, -instance._loaded_score, -1,
+                withdrawn=instance.pub_date
+            )
+            update_title_rating(
+                instance.title_id, instance.score, 1, instance.pub_date
+            )
+        if (instance._loaded_title_id, instance._loaded_score) != (
+            instance.title_id, instance.score
+        ):
+            update_score_count(
+                instance._loaded_title_id, instance._loaded_score, -1
+            )
+            update_score_count(instance.title_id, instance.score, 1)
+    else:
+        # Изменен только текст отзыва: он входит в выгрузку каталога.
+        touch_titles(pk=instance.title_id)
+    instance._loaded_score = instance.score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    title_id = getattr(instance, '_loaded_title_id', instance.title_id)
+    score = getattr(instance, '_loaded_score', instance.score)
+    update_title_rating(title_id, -score, -1, withdrawn=instance.pub_date)
+    update_score_count(title_id, score, -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        pk_set = {instance.pk}
+    if pk_set:
+        touch_titles(pk__in=pk_set)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, raw, **kwargs):
+    if not created and not raw:
+        touch_titles(category=instance)
+
+
+@receiver(post_save, sender=Genre)
+def genre_saved(sender, instance, created, raw, **kwargs):
+    if not created and not raw:
+        touch_titles(genre=instance)
+
+
+@receiver(pre_delete, sender=Genre)
+def genre_deleted(sender, instance, **kwargs):
+    # Связи с произведениями удаляются без сигнала m2m_changed.
+    touch_titles(genre=instance)
@@ -0,0 +1,142 @@
+import heapq
+import multiprocessing
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from math import sqrt
+
+from .models import Review
+
+COSINE = 'cosine'
+ADJUSTED_COSINE = 'adjusted'
+"""Косинусная мера по оценкам за вычетом средней оценки автора."""
+
+_matrix = None
+"""Матрица оценок в процессах пула."""
+
+
+class ScoreMatrix:
+    """Разреженная матрица оценок автор x произведение.
+
+    Строки авторов хранятся в формате CSR (user_ptr, user_titles,
+    user_scores), столбцы произведений - массивами авторов и оценок.
+    Оценки хранятся за вычетом средней оценки автора, если выбрана
+    скорректированная косинусная мера.
+    """
+
+    def __init__(self, metric=ADJUSTED_COSINE):
+        self.metric = metric
+        self.user_ptr = array('l', [0])
+        self.user_titles = array('l')
+        self.user_scores = array('d')
+        self.title_users = {}
+        self.norms = {}
+
+    @classmethod
+    def load(cls, metric=ADJUSTED_COSINE, chunk_size=10000):
+        """Загружает все оценки одним проходом по отзывам."""
+        matrix = cls(metric)
+        rows = Review.objects.order_by('author_id').values_list(
+            'author_id', 'title_id', 'score'
+        ).iterator(chunk_size=chunk_size)
+        author_id = None
+        titles, scores = [], []
+        for row_author_id, title_id, score in rows:
+            if row_author_id != author_id and titles:
+                matrix.add_user(titles, scores)
+                titles, scores = [], []
+            author_id = row_author_id
+            titles.append(title_id)
+            scores.append(score)
+        if titles:
+            matrix.add_user(titles, scores)
+        for title_id, (_, scores) in matrix.title_users.items():
+            matrix.norms[title_id] = sqrt(sum(
+                score * score for score in scores
+            ))
+        return matrix
+
+    def add_user(self, titles, scores):
+        user = len(self.user_ptr) - 1
+        if self.metric == ADJUSTED_COSINE:
+            mean = sum(scores) / len(scores)
+            scores = [score - mean for score in scores]
+        self.user_titles.extend(titles)
+        self.user_scores.extend(scores)
+        self.user_ptr.append(len(self.user_titles))
+        for title_id, score in zip(titles, scores):
+            users, values = self.title_users.setdefault(
+                title_id, (array('l'), array('d'))
+            )
+            users.append(user)
+            values.append(score)
+
+    def neighbours(self, title_id, top_k, min_common=1):
+        """Top-K произведений, похожих на title_id, и их сходство."""
+        norm = self.norms.get(title_id)
+        if not norm:
+            return []
+        products = defaultdict(float)
+        common = defaultdict(int)
+        users, values = self.title_users[title_id]
+        for user, value in zip(users, values):
+            start, end = self.user_ptr[user], self.user_ptr[user + 1]
+            for other, other_value in zip(
+                self.user_titles[start:end], self.user_scores[start:end]
+            ):
+                products[other] += value * other_value
+                common[other] += 1
+        del products[title_id]
+        candidates = (
+            (product / (norm * self.norms[other]), other)
+            for other, product in products.items()
+            if product > 0 and common[other] >= min_common
+        )
+        return [
+            (other, similarity)
+            for similarity, other in heapq.nlargest(top_k, candidates)
+        ]
+
+    def neighbours_block(self, title_ids, top_k, min_common=1):
+        return [
+            (title_id, self.neighbours(title_id, top_k, min_common))
+            for title_id in title_ids
+        ]
+
+
+def _init_worker(matrix):
+    global _matrix
+    _matrix = matrix
+
+
+def _neighbours_block(title_ids, top_k, min_common):
+    return _matrix.neighbours_block(title_ids, top_k, min_common)
+
+
+def iter_neighbours(matrix, title_ids, top_k, min_common=1,
+                    block_size=500, workers=1):
+    """Считает соседей блоками произведений, при workers > 1 - в пуле."""
+    blocks = (
+        title_ids[start:start + block_size]
+        for start in range(0, len(title_ids), block_size)
+    )
+    if workers <= 1:
+        for block in blocks:
+            yield from matrix.neighbours_block(block, top_k, min_common)
+        return
+    # Процессы наследуют матрицу при fork, не копируя ее через pickle.
+    context = multiprocessing.get_context(
+        'fork' if 'fork' in multiprocessing.get_all_start_methods()
+        else None
+    )
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(matrix,)
+    ) as pool:
+        for result in pool.map(
+            _neighbours_block, blocks, repeat(top_k), repeat(min_common)
+        ):
+            yield from result
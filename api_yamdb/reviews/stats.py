@@ -0,0 +1,63 @@
+from math import sqrt
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .constants import MAX_SCORE, MIN_SCORE
+from .models import Review, TitleScoreCount
+
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+"""Корзины гистограммы оценок."""
+
+
+def update_score_count(title_id, score, delta):
+    """Атомарно сдвигает число оценок score у произведения."""
+    updated = TitleScoreCount.objects.filter(
+        title_id=title_id, score=score
+    ).update(count=F('count') + delta)
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            TitleScoreCount.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        # Строку корзины успел создать параллельный запрос.
+        update_score_count(title_id, score, delta)
+
+
+def get_score_counts(title_ids=None):
+    """Считает корзины гистограмм по отзывам за один групповой запрос."""
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        reviews = reviews.filter(title_id__in=title_ids)
+    return reviews.values_list('title_id', 'score').annotate(
+        count=Count('id')
+    ).order_by()
+
+
+def get_score_stats(title_id):
+    """Гистограмма оценок произведения и ее моменты."""
+    counts = dict.fromkeys(SCORES, 0)
+    counts.update(TitleScoreCount.objects.filter(
+        title_id=title_id, count__gt=0
+    ).values_list('score', 'count'))
+    count = sum(counts.values())
+    total = sum(score * number for score, number in counts.items())
+    squares = sum(score ** 2 * number for score, number in counts.items())
+    mean = stddev = None
+    if count:
+        mean = total / count
+        stddev = sqrt(max(squares / count - mean ** 2, 0))
+    return {
+        'count': count,
+        'sum': total,
+        'sum_of_squares': squares,
+        'mean': mean,
+        'stddev': stddev,
+        'histogram': [
+            {'score': score, 'count': number}
+            for score, number in counts.items()
+        ],
+    }
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from math import exp, log
+
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Exp, Greatest, Least, Ln
+
+from .constants import TRENDING_HALF_LIFE
+
+TRENDING_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+"""Начало отсчета уровней активности."""
+
+DECAY_RATE = log(2) / TRENDING_HALF_LIFE
+
+MIN_LEVEL_GAP = 1e-9
+"""Меньший остаток после вычитания вклада считается ошибкой округления."""
+
+
+def activity_level(moment):
+    """Логарифм веса отзыва, опубликованного в момент moment.
+
+    Веса растут экспоненциально со временем, поэтому вместо уменьшения
+    всех накопленных оценок достаточно прибавлять более тяжелые новые.
+    Оценка произведения хранится как логарифм суммы весов, а их
+    порядок от текущего момента не зависит.
+    """
+    return (moment - TRENDING_EPOCH).total_seconds() * DECAY_RATE
+
+
+def add_level(current, level):
+    """Логарифм суммы весов exp(current) и exp(level)."""
+    if current is None:
+        return level
+    high, low = max(current, level), min(current, level)
+    return high + log(1 + exp(low - high))
+
+
+def add_activity(moment):
+    """Выражение для обновления trending_score отзывом из moment."""
+    level = Value(activity_level(moment), output_field=FloatField())
+    high = Greatest(F('trending_score'), level)
+    low = Least(F('trending_score'), level)
+    return Case(
+        When(trending_score__isnull=True, then=level),
+        default=high + Ln(1 + Exp(low - high)),
+        output_field=FloatField()
+    )
+
+
+def subtract_activity(moment):
+    """Выражение для вычитания из trending_score отзыва из moment.
+
+    Если других отзывов не остается, оценка сбрасывается в NULL.
+    """
+    level = Value(activity_level(moment), output_field=FloatField())
+    return Case(
+        When(
+            trending_score__gt=level + MIN_LEVEL_GAP,
+            then=F('trending_score') + Ln(
+                1 - Exp(level - F('trending_score'))
+            )
+        ),
+        default=None,
+        output_field=FloatField()
+    )
+
+
+def decayed_activity(score, moment):
+    """Сумма весов отзывов, уменьшенных на момент moment."""
+    if score is None:
+        return 0.0
+    return exp(score - activity_level(moment))
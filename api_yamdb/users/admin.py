@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseAdmin
 
 from .forms import CustomUserChangeForm, CustomUserCreationForm
+from .models import OutgoingEmail
 
 
 User = get_user_model()
@@ -23,3 +24,18 @@ class UserAdmin(BaseAdmin):
     )
     list_editable = ('role',)
     search_fields = ('username', 'email', 'first_name', 'last_name')
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'created_at',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('recipient', 'dedupe_key')
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Количество писем, отправляемых через одно соединение'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь с интервалом'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Интервал проверки очереди в секундах'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = deliver_pending(options['batch_size'])
+            if processed:
+                self.stdout.write(f'Обработано писем: {processed}')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def fill_lookup_fields(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    User.objects.update(
+        username_lower=Lower('username'),
+        email_lower=Lower('email')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150, verbose_name='Имя пользователя в нижнем регистре'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='email_lower',
+            field=models.EmailField(db_index=True, default='', editable=False, max_length=254, verbose_name='Адрес электронной почты в нижнем регистре'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_lookup_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_lookup_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('admin', 'Админинстратор'), ('moderator', 'Модератор'), ('user', 'Обычный пользователь'), ('partner', 'Партнер')], default='user', max_length=10, verbose_name='Роль пользователя'),
+        ),
+    ]
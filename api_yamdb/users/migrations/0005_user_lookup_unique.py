@@ -0,0 +1,60 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+DUPLICATES_SHOWN = 20
+
+
+def check_duplicates(apps, schema_editor):
+    """Останавливает миграцию, если уникальность уже нарушена.
+
+    Пользователей, совпадающих без учета регистра, нужно объединить
+    или переименовать вручную: выбрать за администратора, чей аккаунт
+    сохранить, миграция не может.
+    """
+    User = apps.get_model('users', 'User')
+    duplicates = {}
+    for field in ('username_lower', 'email_lower'):
+        values = list(
+            User.objects.exclude(**{field: ''}).order_by().values(
+                field
+            ).annotate(users=Count('pk')).filter(users__gt=1).values_list(
+                field, flat=True
+            )[:DUPLICATES_SHOWN]
+        )
+        if values:
+            duplicates[field] = values
+    if duplicates:
+        raise RuntimeError(
+            'Пользователи совпадают без учета регистра: '
+            f'{duplicates}. Объедините или переименуйте их и повторите '
+            'миграцию.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_partner_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(editable=False, max_length=150, verbose_name='Имя пользователя в нижнем регистре'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email_lower',
+            field=models.EmailField(editable=False, max_length=254, verbose_name='Адрес электронной почты в нижнем регистре'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(fields=('username_lower',), name='user_username_lower_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('email_lower', ''), _negated=True), fields=('email_lower',), name='user_email_lower_unique'),
+        ),
+    ]
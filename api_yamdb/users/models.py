@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from .validators import username_validator, validate_username_me
 
@@ -8,10 +9,12 @@ class User(AbstractUser):
     ADMIN = 'admin'
     MODERATOR = 'moderator'
     USER = 'user'
+    PARTNER = 'partner'
     ROLE_CHOIСES = (
         (ADMIN, 'Админинстратор'),
         (MODERATOR, 'Модератор'),
         (USER, 'Обычный пользователь'),
+        (PARTNER, 'Партнер'),
     )
 
     username = models.CharField(
@@ -33,5 +36,121 @@ class User(AbstractUser):
         verbose_name='Роль пользователя'
     )
 
+    username_lower = models.CharField(
+        max_length=150,
+        editable=False,
+        verbose_name='Имя пользователя в нижнем регистре'
+    )
+    email_lower = models.EmailField(
+        editable=False,
+        verbose_name='Адрес электронной почты в нижнем регистре'
+    )
+
+    # Поля для поиска без учета регистра и поля, из которых они заполняются.
+    LOOKUP_FIELDS = {
+        'username': 'username_lower',
+        'email': 'email_lower',
+    }
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=('username_lower',),
+                name='user_username_lower_unique'
+            ),
+            models.UniqueConstraint(
+                fields=('email_lower',),
+                condition=~models.Q(email_lower=''),
+                name='user_email_lower_unique'
+            ),
+        ]
+
     def __str__(self):
         return self.username
+
+    def fill_lookup_fields(self, fields=None):
+        """Заполняет поля поиска без учета регистра.
+
+        Возвращает имена заполненных полей.
+        """
+        filled = []
+        for source, target in self.LOOKUP_FIELDS.items():
+            if fields is None or source in fields:
+                setattr(self, target, getattr(self, source).lower())
+                filled.append(target)
+        return filled
+
+    def save(self, *args, update_fields=None, **kwargs):
+        filled = self.fill_lookup_fields(update_fields)
+        if update_fields is not None:
+            update_fields = {*update_fields, *filled}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    recipient = models.EmailField(verbose_name='Получатель')
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    dedupe_key = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Ключ для исключения повторов'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Количество попыток'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Время следующей попытки'
+    )
+    locked_by = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name='Обработчик, захвативший письмо'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки'
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outgoing_email_due_idx'
+            ),
+            models.Index(
+                fields=('dedupe_key', 'created_at'),
+                name='outgoing_email_dedupe_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,188 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_THREAD = 'thread'
+"""Письма отправляются фоновым потоком процесса приложения."""
+
+DELIVERY_IMMEDIATE = 'immediate'
+"""Письма отправляются сразу после фиксации транзакции в том же потоке."""
+
+DELIVERY_COMMAND = 'command'
+"""Письма отправляет только команда send_emails."""
+
+_executor = None
+_retry_timer = None
+
+
+def queue_email(recipient, subject, body, dedupe_key=''):
+    """Ставит письмо в очередь на отправку.
+
+    Если письмо с тем же dedupe_key уже было поставлено в очередь в
+    пределах EMAIL_OUTBOX_DEDUPE_WINDOW и не завершилось ошибкой, новое
+    письмо не создается. Отправка запускается после фиксации транзакции.
+    """
+    if dedupe_key and OutgoingEmail.objects.filter(
+        dedupe_key=dedupe_key,
+        created_at__gte=timezone.now() - timedelta(
+            seconds=settings.EMAIL_OUTBOX_DEDUPE_WINDOW
+        )
+    ).exclude(status=OutgoingEmail.FAILED).exists():
+        return None
+    email = OutgoingEmail.objects.create(
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        dedupe_key=dedupe_key
+    )
+    transaction.on_commit(schedule_delivery)
+    return email
+
+
+def schedule_delivery():
+    mode = settings.EMAIL_OUTBOX_DELIVERY
+    if mode == DELIVERY_IMMEDIATE:
+        deliver_pending()
+    elif mode == DELIVERY_THREAD:
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='email-outbox'
+            )
+        _executor.submit(_deliver_in_thread)
+
+
+def _deliver_in_thread():
+    try:
+        deliver_pending()
+        schedule_retry()
+    except Exception:
+        logger.exception('Ошибка отправки писем из очереди')
+    finally:
+        connection.close()
+
+
+def schedule_retry():
+    """Планирует отправку к ближайшей повторной попытке.
+
+    Без этого в режиме thread отложенные письма ждали бы постановки
+    в очередь следующего письма.
+    """
+    global _retry_timer
+    next_attempt_at = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING
+    ).aggregate(next=Min('next_attempt_at'))['next']
+    if _retry_timer is not None:
+        _retry_timer.cancel()
+        _retry_timer = None
+    if next_attempt_at is None:
+        return
+    _retry_timer = threading.Timer(
+        max((next_attempt_at - timezone.now()).total_seconds(), 0),
+        schedule_delivery
+    )
+    _retry_timer.daemon = True
+    _retry_timer.start()
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка перед повторной отправкой."""
+    return timedelta(seconds=min(
+        settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_RETRY_DELAY
+    ))
+
+
+def claim_batch(batch_size):
+    """Захватывает пачку писем, которые пора отправить.
+
+    Захват продлевает время следующей попытки на EMAIL_OUTBOX_LEASE,
+    поэтому параллельные обработчики не отправят письмо дважды, а письма
+    упавшего обработчика снова станут доступны по истечении аренды.
+    """
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING, next_attempt_at__lte=now
+    )
+    ids = list(due.values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    due.filter(pk__in=ids).update(
+        locked_by=token,
+        next_attempt_at=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_LEASE
+        )
+    )
+    return list(OutgoingEmail.objects.filter(locked_by=token))
+
+
+def mark_failed_attempt(email, error):
+    email.last_error = repr(error)
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.FAILED
+    else:
+        email.next_attempt_at = (
+            timezone.now() + get_retry_delay(email.attempts)
+        )
+
+
+def send_batch(emails):
+    """Отправляет письма через одно соединение с почтовым сервером."""
+    for email in emails:
+        email.attempts += 1
+        email.locked_by = ''
+    backend = get_connection()
+    try:
+        backend.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed_attempt(email, error)
+    else:
+        try:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        subject=email.subject,
+                        body=email.body,
+                        to=[email.recipient],
+                        connection=backend
+                    ).send()
+                except Exception as error:
+                    mark_failed_attempt(email, error)
+                else:
+                    email.status = OutgoingEmail.SENT
+                    email.sent_at = timezone.now()
+        finally:
+            backend.close()
+    OutgoingEmail.objects.bulk_update(emails, (
+        'status', 'attempts', 'last_error', 'next_attempt_at', 'locked_by',
+        'sent_at'
+    ))
+
+
+def deliver_pending(batch_size=None):
+    """Отправляет все письма, которые пора отправить.
+
+    Возвращает количество обработанных писем.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    processed = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return processed
+        send_batch(emails)
+        processed += len(emails)
@@ -0,0 +1,99 @@
+import io
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+RESULTS_PATH = os.environ.get(
+    'YAMDB_BENCHMARK_RESULTS', os.path.join(BENCHMARK_DIR, 'results.json')
+)
+SCALE = float(os.environ.get('YAMDB_BENCHMARK_SCALE', 1))
+DATASET = {
+    'users': 2000,
+    'categories': 10,
+    'genres': 30,
+    'titles': 2000,
+    'reviews': 50000,
+    'comments': 20000,
+}
+
+
+@pytest.fixture(scope='module')
+def benchmark_data(django_db_setup, django_db_blocker):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.tokens import default_token_generator
+    from django.db.models import Count
+    from rest_framework.test import APIClient
+
+    from api.authentication import get_access_token
+    from reviews.models import Review, Title
+
+    User = get_user_model()
+    with django_db_blocker.unblock():
+        call_command(
+            'generate_load_data',
+            seed=1,
+            stdout=io.StringIO(),
+            **{name: int(count * SCALE) for name, count in DATASET.items()}
+        )
+        admin = User.objects.create_user(
+            username='bench_admin', email='bench_admin@yamdb.fake',
+            role=User.ADMIN
+        )
+        user = User.objects.create_user(
+            username='bench_user', email='bench_user@yamdb.fake'
+        )
+        call_command('build_similar_titles', stdout=io.StringIO())
+        call_command('build_recommendations', stdout=io.StringIO())
+        # Автор с отзывами, для которого рассчитаны рекомендации.
+        reviewer = Review.objects.order_by('pk').first().author
+        title = Title.objects.order_by('-rating_count', 'pk').first()
+        review = title.reviews.annotate(
+            comments_count=Count('comments')
+        ).order_by('-comments_count', 'pk').first()
+        clients = {'anon': APIClient()}
+        for name, client_user in (
+            ('admin', admin), ('user', user), ('reviewer', reviewer)
+        ):
+            token = get_access_token(client_user)
+            clients[name] = APIClient()
+            clients[name].credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        yield {
+            'clients': clients,
+            'user_ids': (admin.pk, user.pk, reviewer.pk),
+            'title_id': title.pk,
+            'title_name': title.name,
+            'year': title.year,
+            'category': title.category.slug,
+            'genre': title.genre.first().slug,
+            'search': title.name.split()[0],
+            'review_id': review.pk,
+            'comment_id': review.comments.order_by('pk').first().pk,
+            'username': reviewer.username,
+            'token_user': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        call_command('flush', interactive=False, verbosity=0)
+
+
+@pytest.fixture(scope='module')
+def benchmark_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding='utf-8') as file:
+        return json.load(file)
+
+
+@pytest.fixture(scope='module')
+def benchmark_results():
+    results = {}
+    yield results
+    with open(RESULTS_PATH, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+    if os.environ.get('YAMDB_BENCHMARK_UPDATE_BASELINE'):
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write('\n')
@@ -0,0 +1,185 @@
+import gc
+import os
+import statistics
+import time
+
+import pytest
+from django.db import connection
+
+from api.authentication import get_user_state
+from api.cache import bump_generations
+
+ROUNDS = int(os.environ.get('YAMDB_BENCHMARK_ROUNDS', 50))
+QUERY_TOLERANCE = int(os.environ.get('YAMDB_BENCHMARK_QUERY_TOLERANCE', 0))
+LATENCY_TOLERANCE = float(
+    os.environ.get('YAMDB_BENCHMARK_LATENCY_TOLERANCE', 1.0)
+)
+LATENCY_SLACK_MS = float(
+    os.environ.get('YAMDB_BENCHMARK_LATENCY_SLACK_MS', 5)
+)
+BYTES_TOLERANCE = float(os.environ.get('YAMDB_BENCHMARK_BYTES_TOLERANCE', 0.1))
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get('YAMDB_BENCHMARK'),
+        reason='Бенчмарки запускаются при YAMDB_BENCHMARK=1'
+    ),
+]
+
+TITLES_URL = '/api/v1/titles/'
+TITLE_URL = '/api/v1/titles/{title_id}/'
+REVIEWS_URL = '/api/v1/titles/{title_id}/reviews/'
+REVIEW_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+COMMENTS_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+COMMENT_URL = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
+)
+
+
+class QueryCounter:
+    """Считает запросы к базе без журнала запросов DEBUG."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def signup_data(context, iteration):
+    return {
+        'username': f'bench_signup_{iteration}',
+        'email': f'bench_signup_{iteration}@yamdb.fake',
+    }
+
+
+def token_data(context, iteration):
+    return {
+        'username': context['token_user'],
+        'confirmation_code': context['confirmation_code'],
+    }
+
+
+ENDPOINTS = {
+    'titles-list': ('anon', 'get', TITLES_URL, None),
+    'titles-list-category': (
+        'anon', 'get', TITLES_URL + '?category={category}', None
+    ),
+    'titles-list-genre': ('anon', 'get', TITLES_URL + '?genre={genre}', None),
+    'titles-list-name': (
+        'anon', 'get', TITLES_URL + '?name={title_name}', None
+    ),
+    'titles-list-year': ('anon', 'get', TITLES_URL + '?year={year}', None),
+    'titles-list-search': (
+        'anon', 'get', TITLES_URL + '?search={search}', None
+    ),
+    'titles-list-cursor': ('anon', 'get', TITLES_URL + '?cursor=', None),
+    'titles-list-fields': (
+        'anon', 'get', TITLES_URL + '?fields=id,name,rating', None
+    ),
+    'titles-trending': ('anon', 'get', TITLES_URL + 'trending/', None),
+    'titles-export': ('admin', 'get', TITLES_URL + 'export/', None),
+    'title-detail': ('anon', 'get', TITLE_URL, None),
+    'title-stats': ('anon', 'get', TITLE_URL + 'stats/', None),
+    'title-similar': ('anon', 'get', TITLE_URL + 'similar/', None),
+    'genres-list': ('anon', 'get', '/api/v1/genres/', None),
+    'categories-list': ('anon', 'get', '/api/v1/categories/', None),
+    'reviews-list': ('anon', 'get', REVIEWS_URL, None),
+    'reviews-list-cursor': ('anon', 'get', REVIEWS_URL + '?cursor=', None),
+    'review-detail': ('anon', 'get', REVIEW_URL, None),
+    'comments-list': ('anon', 'get', COMMENTS_URL, None),
+    'comment-detail': ('anon', 'get', COMMENT_URL, None),
+    'users-list': ('admin', 'get', '/api/v1/users/', None),
+    'user-detail': ('admin', 'get', '/api/v1/users/{username}/', None),
+    'users-me': ('user', 'get', '/api/v1/users/me/', None),
+    'users-me-recommendations': (
+        'reviewer', 'get', '/api/v1/users/me/recommendations/', None
+    ),
+    'signup': ('anon', 'post', '/api/v1/auth/signup/', signup_data),
+    'token': ('anon', 'post', '/api/v1/auth/token/', token_data),
+}
+
+
+def send(context, name, iteration):
+    client_name, method, url, data_factory = ENDPOINTS[name]
+    data = data_factory(context, iteration) if data_factory else None
+    # Кеш ответов сбрасывается, чтобы измерять полный путь обработки;
+    # кешированное состояние пользователей для проверки JWT сохраняется.
+    bump_generations()
+    started = time.perf_counter()
+    response = getattr(context['clients'][client_name], method)(
+        url.format(**context), data=data
+    )
+    # Потоковый ответ формируется при чтении, поэтому читается в замере.
+    content = (
+        b''.join(response.streaming_content) if response.streaming
+        else response.content
+    )
+    return response, content, time.perf_counter() - started
+
+
+def find_regressions(result, expected):
+    regressions = []
+    if result['queries'] > expected['queries'] + QUERY_TOLERANCE:
+        regressions.append(
+            f"запросов {result['queries']} > {expected['queries']}"
+        )
+    for key in ('p50_ms', 'p95_ms'):
+        limit = expected[key] * (1 + LATENCY_TOLERANCE) + LATENCY_SLACK_MS
+        if result[key] > limit:
+            regressions.append(f'{key} {result[key]:.2f} > {limit:.2f}')
+    limit = expected['bytes'] * (1 + BYTES_TOLERANCE)
+    if result['bytes'] > limit:
+        regressions.append(f"байт {result['bytes']} > {limit:.0f}")
+    return regressions
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ENDPOINTS)
+def test_endpoint(name, benchmark_data, benchmark_baseline, benchmark_results,
+                  settings):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    # Замеры повторяют запросы к эндпоинтам аутентификации много раз.
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}
+    }
+
+    for user_id in benchmark_data['user_ids']:
+        get_user_state(user_id)
+    queries = QueryCounter()
+    with connection.execute_wrapper(queries):
+        response, content, _ = send(benchmark_data, name, 0)
+    assert response.status_code < 400, (
+        f'Эндпоинт `{name}` вернул ответ со статусом {response.status_code}.'
+    )
+    # Сборщик мусора отключается на время замеров, чтобы его паузы
+    # не попадали в перцентили отдельных эндпоинтов.
+    gc.collect()
+    gc.disable()
+    try:
+        latencies = [
+            send(benchmark_data, name, iteration)[2] * 1000
+            for iteration in range(1, ROUNDS + 1)
+        ]
+    finally:
+        gc.enable()
+    percentiles = statistics.quantiles(latencies, n=100)
+    result = {
+        'queries': queries.count,
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'bytes': len(content),
+    }
+    benchmark_results[name] = result
+
+    expected = benchmark_baseline.get(name)
+    if expected is not None and not os.environ.get(
+        'YAMDB_BENCHMARK_UPDATE_BASELINE'
+    ):
+        regressions = find_regressions(result, expected)
+        assert not regressions, (
+            f'Регрессия производительности `{name}`: '
+            + ', '.join(regressions)
+        )
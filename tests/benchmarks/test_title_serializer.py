@@ -0,0 +1,62 @@
+import os
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleGetSerializer, TitleReadSerializer
+from reviews.models import Title
+
+ROUNDS = int(os.environ.get('YAMDB_BENCHMARK_ROUNDS', 50)) // 10 or 1
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get('YAMDB_BENCHMARK'),
+        reason='Бенчмарки запускаются при YAMDB_BENCHMARK=1'
+    ),
+]
+
+
+def model_serializer_path():
+    return TitleGetSerializer(
+        Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).order_by('id'),
+        many=True
+    ).data
+
+
+def read_serializer_path():
+    return TitleReadSerializer(
+        Title.objects.order_by('id').values(*TitleReadSerializer.get_values()),
+        many=True
+    ).data
+
+
+def objects_per_second(path):
+    best = 0
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        count = len(path())
+        best = max(best, count / (time.perf_counter() - started))
+    return best
+
+
+@pytest.mark.django_db
+def test_title_serializers(benchmark_data, capsys):
+    renderer = JSONRenderer()
+    assert renderer.render(read_serializer_path()) == renderer.render(
+        model_serializer_path()
+    )
+    model_rate = objects_per_second(model_serializer_path)
+    read_rate = objects_per_second(read_serializer_path)
+    with capsys.disabled():
+        print(
+            f'\nTitleGetSerializer: {model_rate:.0f} объектов/с, '
+            f'TitleReadSerializer: {read_rate:.0f} объектов/с '
+            f'(x{read_rate / model_rate:.1f})'
+        )
+    assert read_rate > model_rate, (
+        'Сериализатор для чтения должен быть быстрее TitleGetSerializer.'
+    )
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+from django.core.cache import cache
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +35,15 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def deliver_emails_immediately(settings):
+    # Письма отправляются в потоке запроса, чтобы тесты видели их сразу.
+    settings.EMAIL_OUTBOX_DELIVERY = 'immediate'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Счетчики ограничения частоты запросов не переходят между тестами.
+    cache.clear()
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_reviews(self, admin_client, admin, user_client,
+                                       user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_title(admin_client, title_id)['rating'] == 5, (
+            'Рейтинг произведения должен обновляться при создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(admin_client, title_id)['rating'] == 6, (
+            'Рейтинг произведения должен обновляться при изменении оценки.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(admin_client, title_id)['rating'] == 6
+
+        moderator.delete()
+        user.delete()
+        assert self.get_title(admin_client, title_id)['rating'] is None, (
+            'Рейтинг произведения должен обновляться при каскадном удалении '
+            'отзывов.'
+        )
+
+    def test_02_recalculate_ratings(self, admin_client, admin, user_client,
+                                    user):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        unchanged = Title.objects.get(pk=titles[1]['id']).updated_at
+
+        call_command('recalculate_ratings', chunk_size=1)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (10, 2)
+        assert title.rating == 5
+        assert Title.objects.get(pk=titles[1]['id']).updated_at == (
+            unchanged
+        ), 'Пересчет не должен менять дату изменения других произведений.'
+        assert self.get_title(admin_client, titles[1]['id'])['rating'] is None
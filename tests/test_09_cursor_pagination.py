@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_cursor_mode_is_opt_in(self, admin_client, admin, user_client,
+                                      user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        data = admin_client.get(url).json()
+        assert data['count'] == len(reviews)
+
+        response = admin_client.get(url, {'cursor': ''})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'В курсорном режиме ответ не должен содержать `count`.'
+        )
+        assert set(data) == {'next', 'previous', 'results'}
+        assert [review['id'] for review in data['results']] == [
+            review['id'] for review in reviews
+        ]
+
+    def test_02_cursor_walks_all_titles(self, client, admin_client):
+        for idx in range(12):
+            admin_client.post('/api/v1/categories/', data={
+                'name': f'Категория {idx}', 'slug': f'category-{idx}'
+            })
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'category': f'category-{idx}'
+            })
+        url = '/api/v1/titles/?cursor='
+        ids = []
+        while url:
+            data = client.get(url).json()
+            ids.extend(title['id'] for title in data['results'])
+            url = data['next']
+        assert len(ids) == 12
+        assert ids == sorted(ids)
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from reviews.models import Review
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleCache:
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_cache_invalidated_on_writes(self, client, admin_client,
+                                            user_client):
+        from api.cache import TITLES_CACHE_NAMESPACE, get_cache_stats
+
+        cache.clear()
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert response.json()['rating'] is None
+        assert get_cache_stats(TITLES_CACHE_NAMESPACE) == {
+            'hits': 1, 'misses': 1
+        }
+
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Создание отзыва должно сбрасывать кеш произведений.'
+        )
+        assert response.json()['rating'] == 7
+
+        response = admin_client.patch(
+            '/api/v1/titles/{}/'.format(titles[0]['id']),
+            data={'genre': ['drama']}
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = client.get(url).json()
+        assert [genre['slug'] for genre in data['genre']] == ['drama']
+
+    def test_02_cache_key_uses_filters_only(self, client, admin_client):
+        cache.clear()
+        create_titles(admin_client)
+
+        response = client.get(self.TITLES_URL, {'genre': 'drama'})
+        assert response.json()['count'] == 1
+        response = client.get(
+            self.TITLES_URL, {'genre': 'drama', 'utm_source': 'mail'}
+        )
+        assert response['X-Cache'] == 'HIT'
+        response = client.get(self.TITLES_URL, {'genre': 'comedy'})
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1
+
+    def test_03_commands_invalidate_cache(self, client, admin_client,
+                                          user_client):
+        cache.clear()
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        stats_url = f'{url}stats/'
+        client.get(url)
+        client.get(self.TITLES_URL)
+        client.get(stats_url)
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        # Массовое изменение оценок не вызывает сигналов моделей.
+        Review.objects.update(score=3)
+        call_command('recalculate_ratings')
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Пересчет рейтинга командой должен сбрасывать кеш произведений.'
+        )
+        assert response.json()['rating'] == 3
+        rating = {
+            item['id']: item['rating']
+            for item in client.get(self.TITLES_URL).json()['results']
+        }
+        assert rating[titles[0]['id']] == 3
+
+        call_command('rebuild_score_histograms')
+        histogram = {
+            bucket['score']: bucket['count']
+            for bucket in client.get(stats_url).json()['histogram']
+            if bucket['count']
+        }
+        assert histogram == {3: 1}, (
+            'Пересчет гистограмм командой должен сбрасывать кеш.'
+        )
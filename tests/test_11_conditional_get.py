@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from reviews.models import Title
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ConditionalGet:
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_list_not_modified(self, client, admin_client,
+                                  django_assert_num_queries):
+        create_titles(admin_client)
+        for url in (self.TITLES_URL, self.GENRES_URL):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            etag = response['ETag']
+            assert response['Last-Modified']
+
+            with django_assert_num_queries(0):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Запрос к `{url}` с актуальным ETag должен возвращать 304.'
+            )
+            assert response['ETag'] == etag
+
+        etag = client.get(self.GENRES_URL)['ETag']
+        admin_client.delete(f'{self.GENRES_URL}drama/')
+        response = client.get(self.GENRES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != etag
+
+    def test_02_detail_not_modified(self, client, admin_client, admin,
+                                    user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id']
+        )
+        response = client.get(url)
+        etag = response['ETag']
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        user_client.patch(url, data={'score': 9})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['score'] == 9
+
+    def test_03_detail_etag_follows_cached_body(self, client, admin_client):
+        from api.cache import TITLES_CACHE_NAMESPACE, bump_generations
+
+        cache.clear()
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+
+        # Запись зафиксирована, а поколение кеша еще не сменилось.
+        Title.objects.filter(pk=titles[0]['id']).update(
+            name='Новое название', updated_at=timezone.now()
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response['X-Cache'] == 'HIT'
+        stale_etag = response['ETag']
+
+        bump_generations((TITLES_CACHE_NAMESPACE,))
+        response = client.get(url, HTTP_IF_NONE_MATCH=stale_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'ETag устаревшего тела из кеша должен меняться вместе с '
+            'поколением кеша.'
+        )
+        assert response.json()['name'] == 'Новое название'
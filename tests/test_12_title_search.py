@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_title(self, admin_client, name, description=''):
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': name,
+            'year': 2000,
+            'category': 'books',
+            'description': description
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        return response.json()['id']
+
+    def search(self, client, text):
+        response = client.get(self.TITLES_URL, {'search': text})
+        assert response.status_code == HTTPStatus.OK
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search_ranked(self, client, admin_client):
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книги', 'slug': 'books'}
+        )
+        hedgehog = self.create_title(admin_client, 'Ёжик в тумане')
+        forest = self.create_title(
+            admin_client, 'Лес', 'Сказка про ежика и медвежонка'
+        )
+        war = self.create_title(admin_client, 'Война и мир')
+
+        assert self.search(client, 'ЕЖИК') == [hedgehog, forest], (
+            'Поиск должен учитывать регистр, букву ё и ставить совпадения '
+            'в названии выше совпадений в описании.'
+        )
+        assert self.search(client, 'войн') == [war]
+        assert self.search(client, 'война "мир') == [war]
+        assert self.search(client, 'ежик медвежонок') == []
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{war}/', data={'name': 'Анна Каренина'}
+        )
+        assert self.search(client, 'война') == []
+        admin_client.delete(f'{self.TITLES_URL}{hedgehog}/')
+        assert self.search(client, 'ежик') == [forest]
+
+        call_command('rebuild_search_index')
+        assert self.search(client, 'каренина') == [war]
+
+    def test_02_search_with_cursor_rejected(self, client, admin_client):
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книги', 'slug': 'books'}
+        )
+        self.create_title(admin_client, 'Ёжик в тумане')
+        response = client.get(
+            self.TITLES_URL, {'search': 'ежик', 'cursor': ''}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Курсорная пагинация не должна молча терять порядок '
+            'релевантности.'
+        )
+        assert 'cursor' in response.json()
+        response = client.get(self.TITLES_URL, {'search': '', 'cursor': ''})
+        assert response.status_code == HTTPStatus.OK
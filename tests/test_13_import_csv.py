@@ -0,0 +1,41 @@
+import csv
+import os
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(file_name):
+    with open(os.path.join(DATA_DIR, file_name), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ImportCsv:
+
+    def test_01_import_all_files(self, capsys):
+        from django.contrib.auth import get_user_model
+        from reviews.models import Comment, Genre, Review, Title
+
+        User = get_user_model()
+        call_command('import_csv')
+        call_command('import_csv')
+
+        assert User.objects.count() == count_rows('users.csv')
+        assert Title.objects.count() == count_rows('titles.csv')
+        assert Genre.objects.count() == count_rows('genre.csv')
+        assert Title.genre.through.objects.count() == count_rows(
+            'genre_title.csv'
+        )
+        assert Review.objects.count() == count_rows('review.csv')
+        assert Comment.objects.count() == count_rows('comments.csv')
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Дата публикации отзыва должна браться из файла.'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.rating_count == title.reviews.count()
+        assert 'строк/с' in capsys.readouterr().out
@@ -0,0 +1,49 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14GenerateLoadData:
+    OPTIONS = {
+        'users': 30,
+        'categories': 3,
+        'genres': 5,
+        'titles': 40,
+        'reviews': 500,
+        'comments': 200,
+        'seed': 7,
+    }
+
+    def snapshot(self):
+        from reviews.models import Review
+
+        return list(Review.objects.order_by('pk').values_list(
+            'author_id', 'title_id', 'score'
+        ))
+
+    def test_01_generate(self):
+        from django.contrib.auth import get_user_model
+        from reviews.models import Comment, Review, Title
+
+        call_command('generate_load_data', **self.OPTIONS)
+        assert get_user_model().objects.count() == 30
+        assert Title.objects.count() == 40
+        assert Review.objects.count() == 500
+        assert Comment.objects.count() == 200
+        title = Title.objects.order_by('-rating_count').first()
+        assert title.rating_count == title.reviews.count() > 500 / 40, (
+            'Популярность произведений должна быть неравномерной.'
+        )
+
+    def test_02_deterministic_seed(self):
+        from django.contrib.auth import get_user_model
+        from reviews.models import Category, Genre, Title
+
+        call_command('generate_load_data', **self.OPTIONS)
+        first = self.snapshot()
+        for model in (Title, Genre, Category, get_user_model()):
+            model.objects.all().delete()
+        call_command('generate_load_data', **self.OPTIONS)
+        assert self.snapshot() == first, (
+            'При одинаковом seed должны генерироваться одинаковые данные.'
+        )
@@ -0,0 +1,37 @@
+import re
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SQLInstrumentation:
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_server_timing(self, client, admin_client, admin, caplog,
+                              settings):
+        settings.SQL_INSTRUMENTATION = True
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        with caplog.at_level('INFO', logger='api.sql'):
+            response = client.get(url)
+        match = re.search(
+            r'db;dur=[\d.]+;desc="(\d+) queries"', response['Server-Timing']
+        )
+        assert match and int(match.group(1)) > 0, (
+            'Заголовок `Server-Timing` должен содержать число SQL-запросов.'
+        )
+        assert 'db-slowest;dur=' in response['Server-Timing']
+        record = caplog.records[-1]
+        assert f'path={url}' in record.getMessage()
+        assert f'queries={match.group(1)}' in record.getMessage()
+
+    def test_02_disabled_by_setting(self, client, settings):
+        settings.SQL_INSTRUMENTATION = False
+        response = client.get('/api/v1/genres/')
+        assert not response.has_header('Server-Timing')
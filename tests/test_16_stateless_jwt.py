@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16StatelessJWT:
+    TOKEN_URL = '/api/v1/auth/token/'
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+    USERS_ME_URL = '/api/v1/users/me/'
+
+    def get_client(self, user):
+        response = APIClient().post(self.TOKEN_URL, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user)
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = response.json()['token']
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client, AccessToken(token)
+
+    def test_01_token_contains_role(self, admin):
+        _, token = self.get_client(admin)
+        assert token['role'] == admin.role
+        assert token['is_superuser'] is admin.is_superuser
+
+    def test_02_no_user_lookup(self, admin):
+        cache.clear()
+        client, _ = self.get_client(admin)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        user_table = admin._meta.db_table
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
+        user_lookups = [
+            query['sql'] for query in context.captured_queries
+            if f'"{user_table}"."id" = ' in query['sql']
+        ]
+        assert not user_lookups, (
+            'При повторном запросе с JWT пользователь не должен '
+            'загружаться из базы данных.'
+        )
+
+        response = client.get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == admin.email
+
+    def test_03_role_change_invalidates_token(self, user):
+        client, _ = self.get_client(user)
+        assert client.get(self.USERS_ME_URL).status_code == HTTPStatus.OK
+
+        user.role = 'admin'
+        user.save()
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Токен, выданный до смены роли, должен отклоняться.'
+        )
+
+        client, _ = self.get_client(user)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+    def test_04_inactive_user_rejected(self, user):
+        client, _ = self.get_client(user)
+        user.is_active = False
+        user.save()
+        response = client.get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+from users.outbox import (
+    deliver_pending,
+    queue_email,
+    schedule_delivery,
+    schedule_retry
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17EmailOutbox:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Регистрация не должна отправлять письмо в потоке запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.recipient == data['email']
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [data['email']]
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+        assert email.attempts == 1
+
+    def test_02_repeated_signup_deduplicated(self, client, settings):
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+        for _ in range(3):
+            assert client.post(
+                self.URL_SIGNUP, data=data
+            ).status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 1, (
+            'Повторная регистрация в пределах окна не должна отправлять '
+            'письмо повторно.'
+        )
+
+        OutgoingEmail.objects.update(
+            created_at=timezone.now() - timedelta(
+                seconds=settings.EMAIL_OUTBOX_DEDUPE_WINDOW + 1
+            )
+        )
+        client.post(self.URL_SIGNUP, data=data)
+        assert len(mail.outbox) == 2
+
+    def test_03_retry_with_backoff(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        queue_email('retry@yamdb.fake', 'Тема', 'Текст')
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=ConnectionError('relay is down')
+        ):
+            assert deliver_pending() == 1
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1
+        assert 'relay is down' in email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Повторная попытка должна откладываться.'
+        )
+        assert deliver_pending() == 0
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=ConnectionError('relay is down')
+        ):
+            deliver_pending()
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.FAILED
+        assert len(mail.outbox) == 0
+
+    def test_04_batch_uses_single_connection(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        for index in range(5):
+            queue_email(f'user{index}@yamdb.fake', 'Тема', 'Текст')
+        with mock.patch(
+            'users.outbox.get_connection', wraps=mail.get_connection
+        ) as get_connection:
+            assert deliver_pending(batch_size=10) == 5
+        assert get_connection.call_count == 1
+        assert len(mail.outbox) == 5
+
+    def test_05_thread_schedules_retry(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        queue_email('retry@yamdb.fake', 'Тема', 'Текст')
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=ConnectionError('relay is down')
+        ):
+            deliver_pending()
+        with mock.patch('users.outbox.threading.Timer') as timer:
+            schedule_retry()
+        delay, callback = timer.call_args[0]
+        assert 0 < delay <= settings.EMAIL_OUTBOX_RETRY_DELAY, (
+            'Отправка должна планироваться к следующей попытке, а не '
+            'ждать нового письма.'
+        )
+        assert callback is schedule_delivery
+        timer.return_value.start.assert_called_once()
+
+        OutgoingEmail.objects.update(status=OutgoingEmail.SENT)
+        with mock.patch('users.outbox.threading.Timer') as timer:
+            schedule_retry()
+        timer.assert_not_called()
@@ -0,0 +1,142 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import IntegrityError
+from rest_framework.validators import UniqueValidator
+
+from api.views import SignUpView
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SignupLookup:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_lookup_fields_filled(self, django_user_model):
+        user = django_user_model.objects.create_user(
+            username='MixedCase', email='Mixed@YaMDb.fake'
+        )
+        assert user.username_lower == 'mixedcase'
+        assert user.email_lower == 'mixed@yamdb.fake'
+
+        user.email = 'Other@YaMDb.fake'
+        user.save(update_fields=['email'])
+        user.refresh_from_db()
+        assert user.email_lower == 'other@yamdb.fake'
+
+    def test_02_single_lookup_query(self, client, django_user_model,
+                                    django_assert_max_num_queries):
+        data = {'username': 'lookup', 'email': 'lookup@yamdb.fake'}
+        client.post(self.URL_SIGNUP, data=data)
+        user_table = django_user_model._meta.db_table
+        with django_assert_max_num_queries(10) as context:
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        user_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{user_table}"' in query['sql']
+        ]
+        assert len(user_selects) == 1, (
+            'Регистрация должна искать пользователя одним запросом.'
+        )
+
+    def test_03_case_insensitive_conflicts(self, client, django_user_model):
+        django_user_model.objects.create_user(
+            username='taken', email='taken@yamdb.fake'
+        )
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'other', 'email': 'TAKEN@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'email' in response.json()
+
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'Taken', 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'username' in response.json()
+        assert django_user_model.objects.count() == 1
+
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'Taken', 'email': 'TAKEN@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Регистрация с username и email, отличающимися от '
+            'существующих регистром, должна отклоняться: токен по ним '
+            'не выдается.'
+        )
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'taken', 'email': 'taken@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_concurrent_signup(self, client, django_user_model):
+        data = {'username': 'racer', 'email': 'racer@yamdb.fake'}
+        django_user_model.objects.create_user(**data)
+        find_user = SignUpView.find_user
+        calls = []
+
+        def find_before_concurrent_create(view, *args):
+            # Первый поиск выполнен до того, как параллельный запрос
+            # создал пользователя.
+            calls.append(args)
+            if len(calls) == 1:
+                return None, None
+            return find_user(view, *args)
+
+        with mock.patch.object(
+            SignUpView, 'find_user', find_before_concurrent_create
+        ):
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert len(calls) == 2
+        assert response.status_code == HTTPStatus.OK
+        assert django_user_model.objects.filter(username='racer').count() == 1
+
+    def test_05_lookup_columns_unique(self, client, django_user_model):
+        data = {'username': 'racer', 'email': 'racer@yamdb.fake'}
+        django_user_model.objects.create_user(**data)
+        with pytest.raises(IntegrityError):
+            django_user_model.objects.create_user(
+                username='RACER', email='other@yamdb.fake'
+            )
+        with pytest.raises(IntegrityError):
+            django_user_model.objects.create_user(
+                username='other', email='Racer@YaMDb.fake'
+            )
+
+        def find_nothing(view, *args):
+            return None, None
+
+        with mock.patch.object(SignUpView, 'find_user', find_nothing):
+            response = client.post(self.URL_SIGNUP, data={
+                'username': 'Racer', 'email': 'other@yamdb.fake'
+            })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Пользователь, отличающийся регистром и созданный '
+            'параллельным запросом, должен приводить к ошибке 400.'
+        )
+        assert django_user_model.objects.count() == 1
+
+    def test_06_user_update_race(self, admin_client, django_user_model):
+        django_user_model.objects.create_user(
+            username='racer', email='racer@yamdb.fake'
+        )
+        validate = UniqueValidator.__call__
+        calls = []
+
+        def validate_after_save(validator, *args):
+            # Первая проверка username и email выполнена до того, как
+            # параллельный запрос занял имя.
+            calls.append(args)
+            if len(calls) > 2:
+                validate(validator, *args)
+
+        with mock.patch.object(
+            UniqueValidator, '__call__', validate_after_save
+        ):
+            response = admin_client.post('/api/v1/users/', data={
+                'username': 'RACER', 'email': 'other@yamdb.fake'
+            })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'username' in response.json()
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+
+from api.authentication import forget_user_state, get_access_token
+from api.throttling import SlidingWindowThrottle
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19AuthThrottling:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    @pytest.fixture
+    def rates(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'auth_ip': '5/min',
+                'auth_identity': '2/min',
+            }
+        }
+
+    def test_01_identity_limit(self, client, rates,
+                               django_assert_num_queries):
+        data = {'username': 'throttled', 'email': 'throttled@yamdb.fake'}
+        for _ in range(2):
+            assert client.post(
+                self.URL_SIGNUP, data=data
+            ).status_code == HTTPStatus.OK
+
+        with django_assert_num_queries(0):
+            response = client.post(self.URL_SIGNUP, data={
+                'username': 'THROTTLED', 'email': 'other@yamdb.fake'
+            })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Превышение лимита для username должно отклоняться до '
+            'обращения к базе данных.'
+        )
+        assert 'Retry-After' in response
+
+        response = client.post(self.URL_TOKEN, data={
+            'username': 'throttled', 'confirmation_code': '123'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_02_ip_limit(self, client, rates):
+        statuses = [
+            client.post(self.URL_TOKEN, data={
+                'username': f'user{index}', 'confirmation_code': '123'
+            }, REMOTE_ADDR='10.0.0.1').status_code
+            for index in range(6)
+        ]
+        assert HTTPStatus.TOO_MANY_REQUESTS not in statuses[:5]
+        assert statuses[5] == HTTPStatus.TOO_MANY_REQUESTS
+
+        response = client.post(self.URL_TOKEN, data={
+            'username': 'another', 'confirmation_code': '123'
+        }, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_03_sliding_window(self, client, rates):
+        data = {'username': 'window', 'email': 'window@yamdb.fake'}
+        with mock.patch.object(
+            SlidingWindowThrottle, 'timer', return_value=600.0
+        ) as timer:
+            for _ in range(2):
+                client.post(self.URL_SIGNUP, data=data)
+            # Середина следующего окна: половина запросов предыдущего
+            # окна еще учитывается.
+            timer.return_value = 690.0
+            assert client.post(
+                self.URL_SIGNUP, data=data
+            ).status_code == HTTPStatus.OK
+            assert client.post(
+                self.URL_SIGNUP, data=data
+            ).status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+            timer.return_value = 780.0
+            assert client.post(
+                self.URL_SIGNUP, data=data
+            ).status_code == HTTPStatus.OK
+
+    def test_04_bearer_token_ignored(self, client, rates, user,
+                                     django_assert_num_queries):
+        token = get_access_token(user)
+        data = {'username': 'throttled', 'email': 'throttled@yamdb.fake'}
+        for _ in range(2):
+            client.post(self.URL_SIGNUP, data=data)
+        forget_user_state(user.pk)
+        for url in (self.URL_SIGNUP, self.URL_TOKEN):
+            with django_assert_num_queries(0):
+                response = client.post(
+                    url,
+                    data={**data, 'confirmation_code': '123'},
+                    HTTP_AUTHORIZATION=f'Bearer {token}'
+                )
+            assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+                'Токен в запросе к эндпоинтам аутентификации не должен '
+                'проверяться до ограничения частоты запросов.'
+            )
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20NestedRoutes:
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_of_other_title(self, admin_client, admin, user_client,
+                                      user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Комментарии к отзыву, который не относится к произведению из '
+            'адреса запроса, не должны выдаваться.'
+        )
+        assert admin_client.get(
+            f'{url}{comments[0]["id"]}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        response = user_client.post(url, data={'text': 'Не туда'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'] + 100, review_id=reviews[0]['id']
+        )
+        assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_review_resolved_once(self, admin_client, admin, user_client,
+                                     user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        review_table = Review._meta.db_table
+        for method, kwargs in (
+            ('get', {}), ('post', {'data': {'text': 'Еще комментарий'}})
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(user_client, method)(url, **kwargs)
+            assert response.status_code < 400
+            review_queries = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+                and f'FROM "{review_table}"' in query['sql']
+            ]
+            assert len(review_queries) == 1, (
+                'Отзыв и произведение из адреса запроса должны загружаться '
+                'одним запросом.'
+            )
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21DuplicateReview:
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_rejected_by_constraint(self, admin_client,
+                                                 user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 7}
+        title_table = Title._meta.db_table
+        review_table = Review._meta.db_table
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        assert not any(f'FROM "{review_table}"' in sql for sql in selects), (
+            'Перед созданием отзыва не должна выполняться проверка '
+            'существующих отзывов.'
+        )
+        assert sum(f'FROM "{title_table}"' in sql for sql in selects) == 1, (
+            'Произведение должно загружаться один раз.'
+        )
+
+        response = user_client.post(url, data={'text': 'Еще', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == (
+            'Нельзя оставить более одного отзыва на произведение'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.reviews.count() == 1
+        assert (title.rating_sum, title.rating_count) == (7, 1), (
+            'Отклоненный отзыв не должен влиять на рейтинг произведения.'
+        )
+
+    def test_02_other_integrity_error_not_masked(self, admin_client,
+                                                 user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with mock.patch(
+            'reviews.signals.update_score_count',
+            side_effect=IntegrityError('other constraint')
+        ):
+            with pytest.raises(IntegrityError):
+                user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert not Review.objects.exists()
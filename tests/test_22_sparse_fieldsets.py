@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, Title
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22SparseFieldsets:
+    TITLES_URL = '/api/v1/titles/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        data, queries = self.get(client, f'{self.TITLES_URL}?fields=name,id')
+        assert data['count'] == 2
+        for title in data['results']:
+            assert set(title) == {'id', 'name'}
+        title_table = Title._meta.db_table
+        assert not any(
+            f'"{title_table}"."description"' in sql for sql in queries
+        ), 'Невыведенные поля не должны загружаться из базы данных.'
+        assert not any(
+            f'"{Genre._meta.db_table}"' in sql for sql in queries
+        ), 'Жанры не должны загружаться, если они не запрошены.'
+
+        data, _ = self.get(client, f'{self.TITLES_URL}?omit=description')
+        title = data['results'][0]
+        assert 'description' not in title
+        assert title['genre'] and title['category']
+
+        data, _ = self.get(
+            client, f'{self.TITLES_URL}?search=орешек&fields=name'
+        )
+        assert data['results'] == [{'name': 'Крепкий орешек'}]
+
+        data, _ = self.get(
+            client,
+            f'{self.TITLES_URL}{title["id"]}/?fields=category,unknown'
+        )
+        assert data == {'category': title['category']}
+
+    def test_02_comments_and_users(self, admin_client, admin, user_client,
+                                   user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        data, queries = self.get(admin_client, f'{url}?omit=author')
+        assert {
+            comment['text'] for comment in data['results']
+        } == {comment['text'] for comment in comments}
+        assert all('author' not in comment for comment in data['results'])
+        assert not any('JOIN "users_user"' in sql for sql in queries)
+
+        data, _ = self.get(admin_client, f'{url}?cursor=&fields=id')
+        assert [set(comment) for comment in data['results']] == [{'id'}] * 2
+
+        data, _ = self.get(admin_client, '/api/v1/users/?fields=username')
+        assert {'username'} == set(data['results'][0])
@@ -0,0 +1,41 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleGetSerializer
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleReadSerializer:
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_same_json_as_model_serializer(self, client, admin_client,
+                                              admin, user_client, user):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        # Дробный рейтинг и произведение без категории.
+        review = Review.objects.filter(title_id=titles[0]['id']).first()
+        review.score = 4
+        review.save()
+        Title.objects.filter(pk=titles[1]['id']).update(category=None)
+        queryset = Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre').order_by('id')
+        renderer = JSONRenderer()
+
+        response = client.get(f'{self.TITLES_URL}?cursor=')
+        expected = TitleGetSerializer(queryset, many=True).data
+        assert renderer.render(response.data['results']) == (
+            renderer.render(expected)
+        ), (
+            'Список произведений должен совпадать с представлением '
+            'TitleGetSerializer.'
+        )
+
+        for title in queryset:
+            response = client.get(f'{self.TITLES_URL}{title.id}/')
+            assert response.content == renderer.render(
+                TitleGetSerializer(title).data
+            )
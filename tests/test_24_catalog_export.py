@@ -0,0 +1,121 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Genre, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24CatalogExport:
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    def read_lines(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, 'Выгрузка должна отдаваться потоком.'
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        content = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_01_access(self, client, user_client, django_user_model):
+        assert client.get(self.EXPORT_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.EXPORT_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        partner = django_user_model.objects.create_user(
+            username='partner', email='partner@yamdb.fake', role='partner'
+        )
+        partner_client = APIClient()
+        partner_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(partner)}'
+        )
+        assert self.read_lines(partner_client.get(self.EXPORT_URL)) == []
+
+    def test_02_export(self, admin_client, admin, user_client, user):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        lines = self.read_lines(admin_client.get(self.EXPORT_URL))
+        assert [line['id'] for line in lines] == [
+            title['id'] for title in titles
+        ]
+        detail = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        exported = dict(lines[0])
+        assert exported.pop('updated_at')
+        assert exported == detail.json(), (
+            'Произведение в выгрузке должно совпадать с его представлением '
+            'в API.'
+        )
+        assert 'reviews' not in lines[0]
+
+        lines = self.read_lines(
+            admin_client.get(f'{self.EXPORT_URL}?reviews=1')
+        )
+        assert {review['author'] for review in lines[0]['reviews']} == {
+            admin.username, user.username
+        }
+        assert lines[1]['reviews'] == []
+
+    def test_03_since(self, admin_client):
+        create_reviews(admin_client, {})
+        old = timezone.now() - timedelta(days=1)
+        old_title = Title.objects.order_by('id').first()
+        Title.objects.filter(pk=old_title.pk).update(updated_at=old)
+
+        since = (old + timedelta(hours=1)).isoformat()
+        lines = self.read_lines(
+            admin_client.get(self.EXPORT_URL, {'since': since})
+        )
+        assert old_title.pk not in [line['id'] for line in lines]
+        assert len(lines) == Title.objects.count() - 1
+
+        response = admin_client.get(self.EXPORT_URL, {'since': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'since' in response.json()
+
+    def test_04_since_related_changes(self, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        old = timezone.now() - timedelta(days=1)
+        since = (old + timedelta(hours=1)).isoformat()
+
+        def changed_titles():
+            return [
+                line['id'] for line in self.read_lines(
+                    admin_client.get(self.EXPORT_URL, {'since': since})
+                )
+            ]
+
+        Title.objects.update(updated_at=old)
+        category = Category.objects.get(titles=titles[1]['id'])
+        category.name = 'Новое название'
+        category.save()
+        assert changed_titles() == [titles[1]['id']], (
+            'Переименование категории должно попадать в выгрузку ?since=.'
+        )
+
+        Title.objects.update(updated_at=old)
+        genre = Genre.objects.filter(titles=titles[0]['id']).first()
+        genre.name = 'Новый жанр'
+        genre.save()
+        assert changed_titles() == [titles[0]['id']]
+
+        Title.objects.update(updated_at=old)
+        Genre.objects.get(titles=titles[1]['id']).delete()
+        assert changed_titles() == [titles[1]['id']]
+
+        Title.objects.update(updated_at=old)
+        response = admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/',
+            data={'text': 'Новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert changed_titles() == [titles[0]['id']], (
+            'Изменение текста отзыва должно попадать в выгрузку ?since=.'
+        )
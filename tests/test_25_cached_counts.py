@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category
+from tests.utils import create_reviews, create_titles
+
+
+def count_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT COUNT(*)')
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25CachedCounts:
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_count_cached_until_write(self, admin_client, admin,
+                                         user_client, user, moderator_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert admin_client.get(url).json()['count'] == 2
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url)
+        assert response.json()['count'] == 2
+        assert not count_queries(context), (
+            'Количество отзывов должно браться из кеша.'
+        )
+        assert 'count_estimated' not in response.json()
+
+        moderator_client.post(url, data={'text': 'Отзыв', 'score': 3})
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url)
+        assert response.json()['count'] == 3, (
+            'Кешированное количество должно сбрасываться при изменении '
+            'отзывов.'
+        )
+        assert count_queries(context)
+
+    def test_02_estimated_count(self, admin_client, settings):
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1
+        create_titles(admin_client)
+        response = admin_client.get(self.TITLES_URL)
+        assert response.json()['count'] == 2
+        assert 'count_estimated' not in response.json()
+
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Новое', 'year': 2000, 'category': 'films'
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        data = admin_client.get(self.TITLES_URL).json()
+        assert data['count'] == 2
+        assert data['count_estimated'] is True, (
+            'Оценка количества должна отмечаться в ответе.'
+        )
+        assert len(data['results']) == 3
+
+        settings.PAGINATION_COUNT_ESTIMATE_MAX_AGE = 0
+        admin_client.delete(f'{self.TITLES_URL}{data["results"][0]["id"]}/')
+        data = admin_client.get(self.TITLES_URL).json()
+        assert data['count'] == 2
+        assert 'count_estimated' not in data
+
+    def test_03_estimate_below_real_count(self, admin_client, settings):
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1
+        Category.objects.create(name='Фильмы', slug='films')
+        for idx in range(10):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}', 'year': 2000,
+                'category': 'films'
+            })
+            assert response.status_code == HTTPStatus.CREATED
+        data = admin_client.get(self.TITLES_URL).json()
+        assert data['count'] == 10
+        assert data['next'] is None
+
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Одиннадцатое', 'year': 2000, 'category': 'films'
+        })
+        response = admin_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Оценка меньше точного количества не должна приводить к ошибке.'
+        )
+        data = response.json()
+        assert (data['count'], data['count_estimated']) == (10, True)
+        assert data['next'].endswith('page=2')
+
+        response = admin_client.get(data['next'])
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert len(data['results']) == 1
+        assert data['next'] is None
+        assert data['previous'] is not None
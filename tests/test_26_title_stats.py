@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import TitleScoreCount
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleStats:
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_stats(self, client, title_id):
+        response = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [bucket['score'] for bucket in data['histogram']] == list(
+            range(11)
+        ), 'Гистограмма должна содержать корзины для оценок от 0 до 10.'
+        data['histogram'] = {
+            bucket['score']: bucket['count']
+            for bucket in data['histogram'] if bucket['count']
+        }
+        return data
+
+    def test_01_stats_follow_reviews(self, client, admin_client, admin,
+                                     user_client, user, moderator_client,
+                                     moderator):
+        reviews, titles = create_reviews(admin_client, {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        })
+        title_id = titles[0]['id']
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram'] == {5: 3}
+        assert (stats['count'], stats['sum'], stats['sum_of_squares']) == (
+            3, 15, 75
+        )
+        assert (stats['mean'], stats['stddev']) == (5, 0)
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram'] == {5: 2, 8: 1}, (
+            'Гистограмма должна обновляться при изменении оценки.'
+        )
+        assert (stats['count'], stats['sum'], stats['sum_of_squares']) == (
+            3, 18, 114
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram'] == {5: 1, 8: 1}
+        assert stats['stddev'] == 1.5
+
+        moderator.delete()
+        user.delete()
+        stats = self.get_stats(client, title_id)
+        assert stats['histogram'] == {}
+        assert (stats['count'], stats['mean'], stats['stddev']) == (
+            0, None, None
+        )
+
+    def test_02_not_found(self, client):
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id=1))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_rebuild_command(self, client, admin_client, admin,
+                                user_client, user):
+        _, titles = create_reviews(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        title_id = titles[0]['id']
+        TitleScoreCount.objects.all().delete()
+        TitleScoreCount.objects.create(title_id=titles[1]['id'], score=1)
+
+        call_command('rebuild_score_histograms')
+
+        assert list(TitleScoreCount.objects.values_list(
+            'title_id', 'score', 'count'
+        )) == [(title_id, 5, 2)]
+        assert self.get_stats(client, title_id)['histogram'] == {5: 2}
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, SimilarTitle, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27SimilarTitles:
+    SIMILAR_URL_TEMPLATE = '/api/v1/titles/{title_id}/similar/'
+    SCORES = (
+        (10, 9, 1, None),
+        (8, 8, 2, 5),
+        (2, 3, 9, 5),
+    )
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(len(self.SCORES[0]))
+        ]
+        for idx, scores in enumerate(self.SCORES):
+            author = django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for title, score in zip(titles, scores):
+                if score is not None:
+                    Review.objects.create(
+                        author=author, title=title, text='-', score=score
+                    )
+        return titles
+
+    def get_similar(self, client, title):
+        response = client.get(
+            self.SIMILAR_URL_TEMPLATE.format(title_id=title.pk)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return [
+            (item['name'], round(item['similarity'], 3))
+            for item in response.json()
+        ]
+
+    def test_01_adjusted_cosine(self, client, titles):
+        assert self.get_similar(client, titles[0]) == []
+
+        call_command('build_similar_titles', '--min-common=2')
+
+        assert self.get_similar(client, titles[0]) == [
+            (titles[1].name, 0.984)
+        ], (
+            'Похожими должны быть произведения с согласованными оценками '
+            'авторов; противоположно оцененные не выводятся.'
+        )
+        assert [name for name, _ in self.get_similar(
+            client, titles[2]
+        )] == [titles[3].name]
+        response = client.get(self.SIMILAR_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_workers_and_cosine(self, titles):
+        call_command('build_similar_titles', '--min-common=1')
+        expected = list(SimilarTitle.objects.values_list(
+            'title_id', 'similar_id', 'rank', 'similarity'
+        ))
+        call_command(
+            'build_similar_titles', '--min-common=1', '--workers=2',
+            '--block-size=1'
+        )
+        assert list(SimilarTitle.objects.values_list(
+            'title_id', 'similar_id', 'rank', 'similarity'
+        )) == expected
+
+        call_command('build_similar_titles', '--metric=cosine', '--top-k=1')
+        assert SimilarTitle.objects.filter(
+            title=titles[0]
+        ).get().similar_id == titles[1].pk
+
+    def test_03_incremental(self, titles):
+        call_command('build_similar_titles')
+        computed_at = dict(SimilarTitle.objects.values_list(
+            'title_id', 'computed_at'
+        ))
+        Review.objects.filter(title=titles[1]).first().delete()
+
+        call_command('build_similar_titles', '--incremental')
+
+        refreshed = {
+            title_id
+            for title_id, at in SimilarTitle.objects.values_list(
+                'title_id', 'computed_at'
+            )
+            if at != computed_at.get(title_id)
+        }
+        assert titles[1].pk in refreshed
+        assert titles[2].pk not in refreshed
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Genre, Recommendation, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Recommendations:
+    RECOMMENDATIONS_URL = '/api/v1/users/me/recommendations/'
+    SCORES = (
+        (10, 9, 1, None),
+        (8, 8, 2, 5),
+        (2, 3, 9, 5),
+    )
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(len(self.SCORES[0]))
+        ]
+        titles[0].genre.set([drama])
+        titles[1].genre.set([drama])
+        for idx, scores in enumerate(self.SCORES):
+            author = django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for title, score in zip(titles, scores):
+                if score is not None:
+                    Review.objects.create(
+                        author=author, title=title, text='-', score=score
+                    )
+        return titles
+
+    def get_recommendations(self, client):
+        response = client.get(self.RECOMMENDATIONS_URL)
+        assert response.status_code == HTTPStatus.OK
+        return [
+            (item['name'], item['predicted_score'])
+            for item in response.json()
+        ]
+
+    def test_01_personal(self, client, user_client, user, titles):
+        assert client.get(self.RECOMMENDATIONS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        Review.objects.create(author=user, title=titles[0], text='-', score=9)
+        Review.objects.create(author=user, title=titles[2], text='-', score=3)
+        call_command('build_similar_titles', '--min-common=1')
+        call_command('build_recommendations')
+
+        recommendations = self.get_recommendations(user_client)
+        assert recommendations[0][0] == titles[1].name, (
+            'Первым должно рекомендоваться произведение, похожее на '
+            'высоко оцененное пользователем.'
+        )
+        assert recommendations[0][1] > 6
+        assert titles[0].name not in dict(recommendations)
+
+        Review.objects.create(author=user, title=titles[1], text='-', score=9)
+        assert titles[1].name not in dict(
+            self.get_recommendations(user_client)
+        ), 'Оцененные произведения не должны рекомендоваться.'
+
+    def test_02_fallback(self, user_client, user, titles):
+        assert self.get_recommendations(user_client) == [
+            (titles[0].name, None),
+            (titles[1].name, None),
+            (titles[2].name, None),
+            (titles[3].name, None),
+        ], 'Без отзывов рекомендуются самые популярные произведения.'
+
+        Review.objects.create(author=user, title=titles[0], text='-', score=9)
+        assert self.get_recommendations(user_client) == [
+            (titles[1].name, None)
+        ], 'Без расчета рекомендуются произведения оцененных жанров.'
+
+    def test_03_resume(self, django_user_model, user, titles):
+        users = list(django_user_model.objects.order_by('pk'))
+        interrupted_at = timezone.now() - timedelta(hours=1)
+        Review.objects.create(author=user, title=titles[0], text='-', score=9)
+        call_command('build_similar_titles', '--min-common=1')
+        Recommendation.objects.create(
+            user=users[0], title=titles[1], rank=1, predicted_score=9,
+            computed_at=interrupted_at
+        )
+
+        call_command('build_recommendations', '--resume', '--chunk-size=1')
+
+        assert set(Recommendation.objects.values_list(
+            'computed_at', flat=True
+        )) == {interrupted_at}
+        assert Recommendation.objects.filter(user=users[0]).get().title_id == (
+            titles[1].pk
+        ), 'Пользователи до контрольной точки не пересчитываются.'
+        assert Recommendation.objects.filter(
+            user__pk__gt=users[0].pk
+        ).exists()
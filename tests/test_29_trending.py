@@ -0,0 +1,96 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Trending:
+    TRENDING_URL = '/api/v1/titles/trending/'
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        books = Category.objects.create(name='Книги', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(3)
+        ]
+        titles[1].category = books
+        titles[1].save()
+        titles[1].genre.set([drama])
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for idx in range(2)
+        ]
+        for author in authors:
+            Review.objects.create(
+                author=author, title=titles[0], text='-', score=5
+            )
+        Review.objects.create(
+            author=authors[0], title=titles[1], text='-', score=5
+        )
+        return titles
+
+    def get_trending(self, client, **params):
+        response = client.get(self.TRENDING_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [
+            (item['name'], round(item['trending'], 2))
+            for item in response.json()
+        ]
+
+    def test_01_trending(self, client, titles):
+        assert self.get_trending(client) == [
+            (titles[0].name, 2), (titles[1].name, 1)
+        ], (
+            'Популярность должна обновляться при создании отзыва; '
+            'произведения без отзывов не выводятся.'
+        )
+        assert self.get_trending(client, category='books') == [
+            (titles[1].name, 1)
+        ]
+        assert self.get_trending(client, genre='drama') == [
+            (titles[1].name, 1)
+        ]
+        response = client.get(self.TRENDING_URL, {'year': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_rebuild(self, client, titles):
+        trending = self.get_trending(client)
+        call_command('rebuild_trending', '--batch-size=1')
+        assert self.get_trending(client) == trending, (
+            'Пересчет по истории должен совпадать с накопленным значением.'
+        )
+
+        Review.objects.filter(title=titles[0]).update(
+            pub_date=timezone.now() - timedelta(days=6)
+        )
+        call_command('rebuild_trending')
+        assert self.get_trending(client) == [
+            (titles[1].name, 1), (titles[0].name, 0.5)
+        ], 'Вклад отзыва должен уменьшаться вдвое за период полураспада.'
+
+    def test_03_delete(self, client, titles):
+        Review.objects.filter(title=titles[0]).first().delete()
+        assert sorted(self.get_trending(client)) == [
+            (titles[0].name, 1), (titles[1].name, 1)
+        ], 'Удаление отзыва должно вычитать его вклад в популярность.'
+        trending = sorted(self.get_trending(client))
+        call_command('rebuild_trending')
+        assert sorted(self.get_trending(client)) == trending
+
+        Review.objects.filter(title=titles[1]).delete()
+        Review.objects.get(title=titles[0]).delete()
+        assert self.get_trending(client) == [], (
+            'Произведения без отзывов не должны выводиться.'
+        )
+        assert not Title.objects.filter(
+            trending_score__isnull=False
+        ).exists()
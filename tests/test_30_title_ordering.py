@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30TitleOrdering:
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        books = Category.objects.create(name='Книги', slug='books')
+        titles = [
+            Title.objects.create(name=name, year=year, category=books)
+            for name, year in (('Бета', 2001), ('Альфа', 2003), ('Гамма', 2002))
+        ]
+        Title.objects.create(name='Дельта', year=2000)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for idx in range(3)
+        ]
+        Review.objects.create(
+            author=authors[0], title=titles[0], text='-', score=10
+        )
+        for author in authors:
+            Review.objects.create(
+                author=author, title=titles[1], text='-', score=9
+            )
+        return titles
+
+    def get_names(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_ordering(self, client, titles):
+        assert self.get_names(client, ordering='-rating') == [
+            'Альфа', 'Бета', 'Гамма', 'Дельта'
+        ], (
+            'Произведение с одной высокой оценкой не должно обгонять '
+            'произведение с несколькими хорошими.'
+        )
+        assert self.get_names(client, ordering='rating', category='books') == [
+            'Гамма', 'Бета', 'Альфа'
+        ]
+        assert self.get_names(client, ordering='name') == [
+            'Альфа', 'Бета', 'Гамма', 'Дельта'
+        ]
+        assert self.get_names(client, ordering='-year') == [
+            'Альфа', 'Гамма', 'Бета', 'Дельта'
+        ]
+        response = client.get(self.TITLES_URL, {'ordering': 'description'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_ranking_follows_reviews(self, titles):
+        assert Title.objects.get(pk=titles[0].pk).ranking == 60 / 11
+        Review.objects.filter(title=titles[1]).first().delete()
+        review = Review.objects.get(title=titles[0])
+        review.score = 0
+        review.save()
+        expected = {
+            title.pk: title.ranking for title in Title.objects.all()
+        }
+        assert expected[titles[0].pk] == 50 / 11
+        assert expected[titles[1].pk] == 68 / 12
+
+        Title.objects.update(ranking=0)
+        call_command('recalculate_ratings')
+        assert {
+            title.pk: title.ranking for title in Title.objects.all()
+        } == expected
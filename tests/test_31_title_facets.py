@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31TitleFacets:
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        books = Category.objects.create(name='Книги', slug='books')
+        films = Category.objects.create(name='Фильмы', slug='films')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        titles = [
+            Title.objects.create(name=name, year=year, category=category)
+            for name, year, category in (
+                ('Война и мир', 1869, books),
+                ('Мир и война', 1869, films),
+                ('Ревизор', 1836, books),
+                ('Без категории', 1836, None),
+            )
+        ]
+        titles[0].genre.set([drama])
+        titles[1].genre.set([drama, comedy])
+        titles[2].genre.set([comedy])
+        return titles
+
+    def get_facets(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('facets')
+
+    def test_01_unfiltered(self, client, titles):
+        assert self.get_facets(client) is None
+        facets = self.get_facets(client, facets='genre,category,year,x')
+        assert facets == {
+            'genre': [
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+                {'slug': 'drama', 'name': 'Драма', 'count': 2},
+            ],
+            'category': [
+                {'slug': 'books', 'name': 'Книги', 'count': 2},
+                {'slug': 'films', 'name': 'Фильмы', 'count': 1},
+            ],
+            'year': [
+                {'value': 1836, 'count': 2},
+                {'value': 1869, 'count': 2},
+            ],
+        }
+        Title.objects.filter(pk=titles[3].pk).update(year=1869)
+        titles[3].genre.set([Genre.objects.get(slug='drama')])
+        facets = self.get_facets(client, facets='genre', page=1)
+        assert facets['genre'][0] == {
+            'slug': 'drama', 'name': 'Драма', 'count': 3
+        }, 'Счетчики должны пересчитываться после изменения данных.'
+
+    def test_02_filtered(self, client, titles):
+        assert self.get_facets(
+            client, facets='genre,category', genre='drama'
+        ) == {
+            'genre': [
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+                {'slug': 'drama', 'name': 'Драма', 'count': 2},
+            ],
+            'category': [
+                {'slug': 'books', 'name': 'Книги', 'count': 1},
+                {'slug': 'films', 'name': 'Фильмы', 'count': 1},
+            ],
+        }, (
+            'Счетчики должны учитывать все фильтры, кроме собственного.'
+        )
+        assert self.get_facets(
+            client, facets='genre,year', year=1836, category='books'
+        ) == {
+            'genre': [{'slug': 'comedy', 'name': 'Комедия', 'count': 1}],
+            'year': [
+                {'value': 1836, 'count': 1},
+                {'value': 1869, 'count': 1},
+            ],
+        }
+        assert self.get_facets(client, facets='year', search='война') == {
+            'year': [{'value': 1869, 'count': 2}]
+        }
+        assert self.get_facets(
+            client, facets='genre', search='ревизор', fields='name'
+        ) == {
+            'genre': [{'slug': 'comedy', 'name': 'Комедия', 'count': 1}]
+        }